@@ -2,12 +2,32 @@
 DQM Client base folder
 """
 
-from . import collections, data, models, util
+import importlib
+
+from . import data, models, util
 
 # Add imports here
 from .client import FractalClient
 from .models import Molecule
 
+# Heavy submodules (pandas, h5py, plotly, ...) are only imported on first access
+_lazy_submodules = {"collections", "statistics", "visualization"}
+_lazy_attributes = {"AsyncFractalClient": "async_client"}
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        return importlib.import_module(f".{name}", __name__)
+    elif name in _lazy_attributes:
+        return getattr(importlib.import_module(f".{_lazy_attributes[name]}", __name__), name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_lazy_submodules) + list(_lazy_attributes))
+
+
 # We are running inside QCPortal repo
 try:
     # The _version file exists only in the QCPortal package
@@ -0,0 +1,388 @@
+"""Provides an asyncio interface to a QCDB Server instance"""
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from .client import (
+    _check_client_version,
+    _connection_error_msg,
+    _decode_response,
+    _encode_request,
+    _ssl_error_msg,
+)
+from .models import build_procedure
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .models import Molecule, ObjectId, ResultRecord, TaskRecord
+    from .models.rest_models import (
+        ComputeResponse,
+        MoleculeGETResponse,
+        ProcedureGETResponse,
+        QueryListStr,
+        QueryObjectId,
+        QueryStr,
+        ResultGETResponse,
+        TaskQueueGETResponse,
+    )
+
+
+class AsyncFractalClient(object):
+    def __init__(
+        self,
+        address: str = "api.qcarchive.molssi.org:443",
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        verify: bool = True,
+        pool_size: int = 100,
+    ) -> None:
+        """Initializes an AsyncFractalClient instance from an address and verification information.
+
+        No connection is made until the first request, ``connect`` may be awaited to fetch the
+        server information up front. The client is best used as an async context manager so that
+        pooled connections are released:
+
+        >>> async with AsyncFractalClient("localhost:7777") as client:
+        ...     mols, results = await asyncio.gather(client.query_molecules(id=ids), client.query_results(id=rids))
+
+        Records returned by this client do not hold a reference to it, as their helper methods are
+        synchronous.
+
+        Parameters
+        ----------
+        address : str
+            The IP and port of the FractalServer instance ("192.168.1.1:8888")
+        username : None, optional
+            The username to authenticate with.
+        password : None, optional
+            The password to authenticate with.
+        verify : bool, optional
+            Verifies the SSL connection with a third party server.
+        pool_size : int, optional
+            The maximum number of connections kept open to the server. Requests beyond this number
+            wait for a free connection.
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError(
+                "AsyncFractalClient requires httpx, please install it with `pip install httpx` "
+                "or `conda install httpx -c conda-forge`."
+            )
+
+        if "http" not in address:
+            address = "https://" + address
+
+        if not address.endswith("/"):
+            address += "/"
+
+        from . import __version__  # Import here to avoid circular import
+
+        self.address = address
+        self.username = username
+        self._verify = verify
+        self.encoding = "msgpack-ext"
+
+        self._headers: Dict[str, str] = {}
+        if (username is not None) or (password is not None):
+            self._headers["Authorization"] = json.dumps({"username": username, "password": password})
+        self._headers["Content-Type"] = f"application/{self.encoding}"
+        self._headers["User-Agent"] = f"qcportal/{__version__}"
+
+        limits = httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        self._client = httpx.AsyncClient(limits=limits, verify=verify, timeout=None)
+
+        self.server_info: Optional[Dict[str, Any]] = None
+        self.server_name: Optional[str] = None
+        self.query_limit: Optional[int] = None
+
+    def __repr__(self) -> str:
+        return "AsyncFractalClient(server_name='{}', address='{}', username='{}')".format(
+            self.server_name, self.address, self.username
+        )
+
+    async def __aenter__(self) -> "AsyncFractalClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def connect(self) -> None:
+        """Pulls the server information and checks that the server accepts this client version."""
+        from . import _isportal
+
+        self.server_info = (await self._automodel_request("information", "get", {}, full_return=True)).dict()
+        self.server_name = self.server_info["name"]
+        self.query_limit = self.server_info["query_limit"]
+
+        if _isportal:
+            _check_client_version(self.server_info, self.address)
+
+    async def close(self) -> None:
+        """Closes all pooled connections to the server."""
+        await self._client.aclose()
+
+    async def _request(
+        self, method: str, service: str, *, data: Optional[bytes] = None, noraise: bool = False, timeout=None
+    ) -> Any:
+        import httpx
+
+        if method not in {"get", "post", "put", "delete"}:
+            raise KeyError("Method not understood: '{}'".format(method))
+
+        try:
+            r = await self._client.request(
+                method.upper(), self.address + service, content=data, headers=self._headers, timeout=timeout
+            )
+        except httpx.ConnectError as exc:
+            if "ssl" in str(exc).lower() or "certificate" in str(exc).lower():
+                raise ConnectionRefusedError(_ssl_error_msg) from None
+            raise ConnectionRefusedError(_connection_error_msg.format(self.address)) from None
+
+        if (r.status_code != 200) and (not noraise):
+            raise IOError("Server communication failure. Reason: {}".format(r.reason_phrase))
+
+        return r
+
+    async def _automodel_request(
+        self, name: str, rest: str, payload: Dict[str, Any], full_return: bool = False, timeout: int = None
+    ) -> Any:
+        """Asynchronous counterpart of ``FractalClient._automodel_request``"""
+        sname = name.strip("/")
+
+        response_model, body = _encode_request(sname, rest, payload, self.encoding)
+
+        r = await self._request(rest, name, data=body, timeout=timeout)
+        response, _, _ = _decode_response(response_model, r.content, r.headers["Content-Type"])
+
+        if full_return:
+            return response
+        else:
+            return response.data
+
+    async def gather_chunks(
+        self, func: Callable[[List[Any]], Awaitable[Any]], items: List[Any], chunk_size: Optional[int] = None
+    ) -> List[Any]:
+        """Awaits a coroutine function over sequential chunks of a list concurrently.
+
+        Parameters
+        ----------
+        func : Callable[[List[Any]], Awaitable[Any]]
+            The coroutine function to call on each chunk, for example ``lambda ids: client.query_molecules(id=ids)``
+        items : List[Any]
+            The items to split into chunks
+        chunk_size : Optional[int], optional
+            The size of each chunk, defaults to the server ``query_limit``
+
+        Returns
+        -------
+        List[Any]
+            The result of each call in the same order as the chunks
+        """
+        if chunk_size is None:
+            if self.query_limit is None:
+                await self.connect()
+            chunk_size = self.query_limit
+
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+        return list(await asyncio.gather(*[func(chunk) for chunk in chunks]))
+
+    ### Molecule section
+
+    async def query_molecules(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        molecule_hash: Optional["QueryStr"] = None,
+        molecular_formula: Optional["QueryStr"] = None,
+        limit: Optional[int] = None,
+        skip: int = 0,
+        full_return: bool = False,
+    ) -> Union["MoleculeGETResponse", List["Molecule"]]:
+        """Queries molecules from the database, see ``FractalClient.query_molecules``."""
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip},
+            "data": {"id": id, "molecule_hash": molecule_hash, "molecular_formula": molecular_formula},
+        }
+        return await self._automodel_request("molecule", "get", payload, full_return=full_return)
+
+    ### Results section
+
+    async def query_results(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        task_id: Optional["QueryObjectId"] = None,
+        program: Optional["QueryStr"] = None,
+        molecule: Optional["QueryObjectId"] = None,
+        driver: Optional["QueryStr"] = None,
+        method: Optional["QueryStr"] = None,
+        basis: Optional["QueryStr"] = None,
+        keywords: Optional["QueryObjectId"] = None,
+        status: "QueryStr" = "COMPLETE",
+        limit: Optional[int] = None,
+        skip: int = 0,
+        include: Optional["QueryListStr"] = None,
+        full_return: bool = False,
+    ) -> Union["ResultGETResponse", List["ResultRecord"], Dict[str, Any]]:
+        """Queries ResultRecords from the server, see ``FractalClient.query_results``."""
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip, "include": include},
+            "data": {
+                "id": id,
+                "task_id": task_id,
+                "program": program,
+                "molecule": molecule,
+                "driver": driver,
+                "method": method,
+                "basis": basis,
+                "keywords": keywords,
+                "status": status,
+            },
+        }
+        return await self._automodel_request("result", "get", payload, full_return=full_return)
+
+    async def query_procedures(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        task_id: Optional["QueryObjectId"] = None,
+        procedure: Optional["QueryStr"] = None,
+        program: Optional["QueryStr"] = None,
+        hash_index: Optional["QueryStr"] = None,
+        status: "QueryStr" = "COMPLETE",
+        limit: Optional[int] = None,
+        skip: int = 0,
+        include: Optional["QueryListStr"] = None,
+        full_return: bool = False,
+    ) -> Union["ProcedureGETResponse", List[Dict[str, Any]]]:
+        """Queries Procedures from the server, see ``FractalClient.query_procedures``."""
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip, "include": include},
+            "data": {
+                "id": id,
+                "task_id": task_id,
+                "program": program,
+                "procedure": procedure,
+                "hash_index": hash_index,
+                "status": status,
+            },
+        }
+        response = await self._automodel_request("procedure", "get", payload, full_return=True)
+
+        if not include:
+            for ind in range(len(response.data)):
+                response.data[ind] = build_procedure(response.data[ind])
+
+        if full_return:
+            return response
+        else:
+            return response.data
+
+    ### Compute section
+
+    async def add_compute(
+        self,
+        program: str = None,
+        method: str = None,
+        basis: Optional[str] = None,
+        driver: str = None,
+        keywords: Optional["ObjectId"] = None,
+        molecule: Union["ObjectId", "Molecule", List[Union["ObjectId", "Molecule"]]] = None,
+        *,
+        priority: Optional[str] = None,
+        protocols: Optional[Dict[str, Any]] = None,
+        tag: Optional[str] = None,
+        full_return: bool = False,
+    ) -> "ComputeResponse":
+        """Adds a "single" compute to the server, see ``FractalClient.add_compute``."""
+
+        # Scan the input
+        if program is None:
+            raise ValueError("Program must be specified for the computation.")
+        if method is None:
+            raise ValueError("Method must be specified for the computation.")
+        if driver is None:
+            raise ValueError("Driver must be specified for the computation.")
+        if molecule is None:
+            raise ValueError("Molecule must be specified for the computation.")
+
+        # Always a list
+        if not isinstance(molecule, list):
+            molecule = [molecule]
+
+        if protocols is None:
+            protocols = {}
+
+        payload = {
+            "meta": {
+                "procedure": "single",
+                "driver": driver,
+                "program": program,
+                "method": method,
+                "basis": basis,
+                "keywords": keywords,
+                "protocols": protocols,
+                "tag": tag,
+                "priority": priority,
+            },
+            "data": molecule,
+        }
+
+        return await self._automodel_request("task_queue", "post", payload, full_return=full_return)
+
+    async def query_tasks(
+        self,
+        id: Optional["QueryObjectId"] = None,
+        hash_index: Optional["QueryStr"] = None,
+        program: Optional["QueryStr"] = None,
+        status: Optional["QueryStr"] = None,
+        base_result: Optional["QueryStr"] = None,
+        tag: Optional["QueryStr"] = None,
+        manager: Optional["QueryStr"] = None,
+        limit: Optional[int] = None,
+        skip: int = 0,
+        include: Optional["QueryListStr"] = None,
+        full_return: bool = False,
+    ) -> Union["TaskQueueGETResponse", List["TaskRecord"], List[Dict[str, Any]]]:
+        """Checks the status of Tasks in the Fractal queue, see ``FractalClient.query_tasks``."""
+
+        payload = {
+            "meta": {"limit": limit, "skip": skip, "include": include},
+            "data": {
+                "id": id,
+                "hash_index": hash_index,
+                "program": program,
+                "status": status,
+                "base_result": base_result,
+                "tag": tag,
+                "manager": manager,
+            },
+        }
+
+        return await self._automodel_request("task_queue", "get", payload, full_return=full_return)
+
+    async def custom_query(
+        self,
+        object_name: str,
+        query_type: str,
+        data: Dict[str, Any],
+        limit: Optional[int] = None,
+        skip: int = 0,
+        meta: Dict[str, Any] = None,
+        include: Optional["QueryListStr"] = None,
+        full_return: bool = False,
+    ) -> Any:
+        """Custom queries that are supported by the REST APIs, see ``FractalClient.custom_query``."""
+
+        payload = {"meta": {"limit": limit, "skip": skip, "include": include}, "data": data}
+        if meta:
+            payload["meta"].update(meta)
+
+        if query_type:
+            addr = f"{object_name}/{query_type}"
+        else:
+            addr = object_name
+
+        return await self._automodel_request(addr, "get", payload, full_return=full_return)
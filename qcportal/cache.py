@@ -0,0 +1,294 @@
+"""
+In-memory and persistent on-disk caches for immutable server objects
+"""
+
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class DiskCache:
+    """
+    A SQLite-backed cache of Molecules and COMPLETE records, keyed by server address, object type and id.
+
+    Objects are stored pickled so that hits are returned without pydantic re-validation. Objects are
+    keyed by the qcportal version that stored them, as pickles of other versions may not load against
+    the current models; objects which fail to load are treated as misses and removed. The cache holds
+    at most ``max_size`` bytes and evicts the least recently used objects beyond that budget.
+    """
+
+    # Bumped whenever the table layout changes, older tables are dropped
+    _schema_version = 2
+
+    def __init__(self, path: str, max_size: int = 2 ** 30, version: Optional[str] = None) -> None:
+        """
+        Parameters
+        ----------
+        path : str
+            The SQLite file to use, or a directory in which ``qcportal_cache.sqlite`` is created.
+        max_size : int, optional
+            The maximum number of bytes of cached objects, defaults to 1 GiB.
+        version : Optional[str], optional
+            The version objects are stored and looked up under, defaults to the qcportal version.
+        """
+        if version is None:
+            from . import __version__  # Import here to avoid circular import
+
+            version = __version__
+
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            path = os.path.join(path, "qcportal_cache.sqlite")
+
+        self.path = path
+        self.max_size = max_size
+        self.version = version
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != self._schema_version:
+            self._conn.execute("DROP TABLE IF EXISTS objects")
+            self._conn.execute(f"PRAGMA user_version = {self._schema_version}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS objects (version TEXT, address TEXT, kind TEXT, id TEXT, data BLOB, "
+            "size INTEGER, last_access REAL, PRIMARY KEY (version, address, kind, id))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS objects_last_access ON objects (last_access)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS server_info (address TEXT PRIMARY KEY, data TEXT, stored REAL)")
+
+        # A running total of the stored bytes, so that puts do not sum over the whole table
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def __repr__(self) -> str:
+        return f"DiskCache(path='{self.path}', max_size={self.max_size}, version='{self.version}')"
+
+    def get(self, address: str, kind: str, ids: List[str]) -> Dict[str, Any]:
+        """Returns all cached objects of the given ids
+
+        Parameters
+        ----------
+        address : str
+            The server address the objects belong to
+        kind : str
+            The type of object, such as "molecule" or "result"
+        ids : List[str]
+            The ids to look up
+
+        Returns
+        -------
+        Dict[str, Any]
+            The found objects in {id: object} format, ids not in the cache are omitted
+        """
+        ret = {}
+        if len(ids) == 0:
+            return ret
+
+        key = [self.version, address, kind]
+        with self._lock:
+            # Stay below the SQLite host parameter limit
+            for i in range(0, len(ids), 500):
+                chunk = ids[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT id, data, size FROM objects WHERE version = ? AND address = ? AND kind = ? "
+                    f"AND id IN ({marks})",
+                    [*key, *chunk],
+                ).fetchall()
+
+                broken = []
+                for oid, data, size in rows:
+                    try:
+                        ret[oid] = pickle.loads(data)
+                    except Exception:
+                        # Stale or corrupt entries are misses
+                        broken.append((*key, oid))
+                        self._total -= size
+
+                if broken:
+                    self._conn.executemany(
+                        "DELETE FROM objects WHERE version = ? AND address = ? AND kind = ? AND id = ?", broken
+                    )
+
+                self._conn.execute(
+                    f"UPDATE objects SET last_access = ? WHERE version = ? AND address = ? AND kind = ? "
+                    f"AND id IN ({marks})",
+                    [time.time(), *key, *chunk],
+                )
+
+        return ret
+
+    def put(self, address: str, kind: str, objects: List[Any]) -> None:
+        """Stores objects in the cache and evicts the least recently used objects beyond the size budget
+
+        Parameters
+        ----------
+        address : str
+            The server address the objects belong to
+        kind : str
+            The type of object, such as "molecule" or "result"
+        objects : List[Any]
+            The objects to store, each must have an ``id``
+        """
+        if len(objects) == 0:
+            return
+
+        now = time.time()
+        rows = []
+        for obj in objects:
+            # Records carry a live client and a per-session cache that must not be persisted
+            if "client" in obj.__fields__:
+                obj = obj.copy(update={"client": None, "cache": {}})
+            data = pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+            rows.append((self.version, address, kind, obj.id, data, len(data), now))
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+
+            # Replaced objects no longer count towards the total
+            for i in range(0, len(rows), 500):
+                chunk = [row[3] for row in rows[i : i + 500]]
+                marks = ",".join("?" * len(chunk))
+                self._total -= self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM objects WHERE version = ? AND address = ? AND kind = ? "
+                    f"AND id IN ({marks})",
+                    [self.version, address, kind, *chunk],
+                ).fetchone()[0]
+
+            self._conn.executemany("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            self._total += sum(row[5] for row in rows)
+
+            if self._total > self.max_size:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Other processes may share the file, so recount before evicting
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if self._total <= self.max_size:
+            return
+
+        excess = self._total - self.max_size
+        doomed = []
+        for rowid, size in self._conn.execute("SELECT rowid, size FROM objects ORDER BY last_access"):
+            doomed.append((rowid,))
+            excess -= size
+            self._total -= size
+            if excess <= 0:
+                break
+
+        self._conn.execute("BEGIN")
+        self._conn.executemany("DELETE FROM objects WHERE rowid = ?", doomed)
+        self._conn.execute("COMMIT")
+
+    def get_server_info(self, address: str, ttl: float) -> Optional[Dict[str, Any]]:
+        """Returns the stored server information of an address if it is younger than ``ttl`` seconds"""
+        with self._lock:
+            row = self._conn.execute("SELECT data, stored FROM server_info WHERE address = ?", [address]).fetchone()
+
+        if row is None or (time.time() - row[1]) > ttl:
+            return None
+        return json.loads(row[0])
+
+    def put_server_info(self, address: str, server_info: Dict[str, Any]) -> None:
+        """Stores the server information of an address"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO server_info VALUES (?, ?, ?)", [address, json.dumps(server_info), time.time()]
+            )
+
+    def size(self) -> int:
+        """Returns the number of bytes of cached objects"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+
+    def clear(self) -> None:
+        """Removes all objects from the cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM objects")
+            self._conn.execute("DELETE FROM server_info")
+            self._total = 0
+
+    def close(self) -> None:
+        """Closes the underlying database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+class IdentityMap:
+    """
+    A bounded in-memory map from (kind, id) to a single shared Python object.
+
+    Repeated lookups of the same id return the same object, so objects shared between many records or
+    entries are held in memory once. Beyond ``max_entries`` the least recently used objects are dropped.
+    """
+
+    def __init__(self, max_entries: int = 10000) -> None:
+        """
+        Parameters
+        ----------
+        max_entries : int, optional
+            The maximum number of objects held
+        """
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[Tuple[str, Hashable], Any]" = OrderedDict()
+
+    def __repr__(self) -> str:
+        return f"IdentityMap(entries={len(self._data)}, max_entries={self.max_entries})"
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, kind: str, ids: List[Hashable]) -> Dict[Hashable, Any]:
+        """Returns all held objects of the given ids in {id: object} format"""
+        ret = {}
+        with self._lock:
+            for oid in ids:
+                obj = self._data.get((kind, oid))
+                if obj is not None:
+                    self._data.move_to_end((kind, oid))
+                    ret[oid] = obj
+        return ret
+
+    def canonicalize(self, kind: str, objects: List[Any]) -> List[Any]:
+        """Stores new objects and replaces already held ones by the held instance
+
+        Parameters
+        ----------
+        kind : str
+            The type of object, such as "molecule" or "result"
+        objects : List[Any]
+            The objects to canonicalize, each must have an ``id``
+
+        Returns
+        -------
+        List[Any]
+            The canonical objects in the same order
+        """
+        ret = []
+        with self._lock:
+            for obj in objects:
+                key = (kind, obj.id)
+                held = self._data.get(key)
+                if held is None:
+                    self._data[key] = held = obj
+                else:
+                    self._data.move_to_end(key)
+                ret.append(held)
+
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+        return ret
+
+    def clear(self) -> None:
+        """Removes all objects"""
+        with self._lock:
+            self._data.clear()
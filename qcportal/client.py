@@ -1,21 +1,42 @@
 """Provides an interface the QCDB Server instance"""
 
+import gzip
 import json
 import os
 import re
+import threading
+import time
 from collections import defaultdict
-from typing import TYPE_CHECKING, Any, DefaultDict, Dict, List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-import pandas as pd
 import requests
 from pydantic import ValidationError
+from qcelemental.util import deserialize
+from urllib3.util import make_headers
 
-from .collections import collection_factory, collections_name_map
+from .cache import DiskCache, IdentityMap
+from .coalescer import RequestCoalescer
+from .metrics import ClientMetrics
 from .models import build_procedure
 from .models.task_models import PriorityEnum
+from .models.model_utils import construct_model
 from .models.rest_models import rest_model
 
 if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
     from qcfractal import FractalServer
 
     from .collections.collection import Collection
@@ -28,6 +49,7 @@ if TYPE_CHECKING:  # pragma: no cover
         TaskRecord,
         TorsionDriveInput,
     )
+    from .models.records import RecordBase
     from .models.rest_models import (
         CollectionGETResponse,
         ComputeResponse,
@@ -65,6 +87,92 @@ def _version_list(version):
     return [int(x) for x in version.split(".")]
 
 
+def _check_client_version(server_info: Dict[str, Any], address: str) -> None:
+    """Raises an IOError if this client version is outside the range the server accepts"""
+    from . import __version__  # Import here to avoid circular import
+
+    try:
+        server_version_min_client = _version_list(server_info["client_lower_version_limit"])[:2]
+        server_version_max_client = _version_list(server_info["client_upper_version_limit"])[:2]
+    except KeyError:
+        server_ver_str = ".".join([str(i) for i in server_info["version"]])
+        raise IOError(
+            f"The Server at {address}, version {server_info['version']} does not report "
+            f"what Client versions it accepts! It can be almost asserted your Client is too new for "
+            f"the Server you are connecting to. Please downgrade your Client with "
+            f"the one of following commands (pip or conda):"
+            f"\n\t- pip install qcportal=={server_ver_str}"
+            f"\n\t- conda install -c conda-forge qcportal=={server_ver_str}"
+            f"\n(Only MAJOR.MINOR versions are checked)"
+        )
+    client_version = _version_list(__version__)[:2]
+    if not server_version_min_client <= client_version <= server_version_max_client:
+        client_ver_str = ".".join([str(i) for i in client_version])
+        server_version_min_str = ".".join([str(i) for i in server_version_min_client])
+        server_version_max_str = ".".join([str(i) for i in server_version_max_client])
+        raise IOError(
+            f"This Client of version {client_ver_str} does not fall within the Server's allowed "
+            f"Client versions of [{server_version_min_str}, {server_version_max_str}] at "
+            f"Server address: {address}. Please change your Client version with one of the "
+            f"following commands:"
+            f"\n\t- pip install qcportal=={server_version_max_str}.*"
+            f"\n\t- conda install -c conda-forge qcportal=={server_version_max_str}.*"
+            f"\n(Only MAJOR.MINOR versions are checked and shown)"
+        )
+
+
+def _compress_body(data: bytes, compression: str) -> bytes:
+    """Compresses a request body with the given Content-Encoding"""
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    elif compression == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        raise KeyError("Compression not understood: '{}'".format(compression))
+
+
+def _encode_request(name: str, rest: str, payload: Dict[str, Any], encoding: str) -> Tuple[Any, bytes]:
+    """Validates a request payload against the REST model registry and serializes it
+
+    Returns the response model of the endpoint and the serialized body.
+    """
+    body_model, response_model = rest_model(name, rest)
+
+    # Provide a reasonable traceback
+    try:
+        payload = body_model(**payload)
+    except ValidationError as exc:
+        raise TypeError(str(exc))
+
+    return response_model, payload.serialize(encoding)
+
+
+def _decode_response(
+    response_model: Any, content: bytes, content_type: str, validate: bool = True
+) -> Tuple[Any, float, float]:
+    """Parses a raw server response into its REST response model
+
+    If ``validate`` is False the models are built from the trusted response without pydantic validation.
+    Returns the response together with the seconds spent decoding the body and validating the models.
+    """
+    encoding = content_type.split("/")[1]
+
+    start = time.perf_counter()
+    if encoding in {"json", "json-ext"} and isinstance(content, bytes):
+        # The JSON deserializers only accept text
+        content = content.decode("utf-8")
+    data = deserialize(content, encoding)
+    decoded = time.perf_counter()
+    if validate:
+        response = response_model.parse_obj(data)
+    else:
+        response = construct_model(response_model, data)
+
+    return response, decoded - start, time.perf_counter() - decoded
+
+
 ### Fractal Client
 
 
@@ -75,6 +183,18 @@ class FractalClient(object):
         username: Optional[str] = None,
         password: Optional[str] = None,
         verify: bool = True,
+        pool_size: int = 10,
+        keep_alive: bool = True,
+        max_workers: int = 1,
+        compression: Optional[str] = None,
+        compression_threshold: int = 1024,
+        cache_dir: Optional[str] = None,
+        cache_max_size: int = 2 ** 30,
+        coalesce_window: float = 0.0,
+        lazy: bool = False,
+        server_info_ttl: Optional[float] = None,
+        trusted_server: bool = False,
+        identity_map_size: Optional[int] = None,
     ) -> None:
         """Initializes a FractalClient instance from an address and verification information.
 
@@ -91,6 +211,43 @@ class FractalClient(object):
             Verifies the SSL connection with a third party server. This may be False if a
             FractalServer was not provided a SSL certificate and defaults back to self-signed
             SSL keys.
+        pool_size : int, optional
+            The maximum number of pooled connections kept open to the server. Should be at least
+            as large as the number of threads issuing requests through this client.
+        keep_alive : bool, optional
+            Reuses TCP/TLS connections between requests if True. If False, every request opens a
+            new connection which is closed once the response is read.
+        max_workers : int, optional
+            The maximum number of chunked requests issued concurrently when large queries are split
+            into ``query_limit`` sized pieces. The default of 1 issues chunks one after another.
+        compression : Optional[str], optional
+            Compresses request bodies with this Content-Encoding, one of {"gzip", "zstd"}. The server
+            must accept compressed bodies. Compressed responses are always accepted and decoded.
+        compression_threshold : int, optional
+            Request bodies smaller than this number of bytes are sent uncompressed.
+        cache_dir : Optional[str], optional
+            Enables a persistent on-disk cache of Molecules and COMPLETE records in this directory.
+            Queries by ``id`` alone are served from the cache where possible and only the missing
+            ids are requested from the server.
+        cache_max_size : int, optional
+            The size budget of the on-disk cache in bytes, least recently used objects are evicted beyond it.
+        coalesce_window : float, optional
+            Single object lookups from record helpers (such as ``ResultRecord.get_molecule``) made concurrently
+            from several threads are batched into one query. A positive window, in seconds, additionally
+            waits this long for further lookups before each batch is sent.
+        lazy : bool, optional
+            Defers the initial handshake with the server until the first request or the first access of
+            ``server_info``, ``server_name`` or ``query_limit``.
+        server_info_ttl : Optional[float], optional
+            Stores the server information in the on-disk cache and reuses it for this many seconds, so
+            that new clients start without a round-trip. Requires ``cache_dir``.
+        trusted_server : bool, optional
+            Builds response objects without pydantic validation, which is considerably faster for large
+            responses. Only use this with a server whose responses are trusted to be well formed.
+        identity_map_size : Optional[int], optional
+            If given, the number of Molecules and COMPLETE records held in memory so that repeated queries
+            of the same id return the same object without a round-trip, least recently used objects are
+            dropped beyond it. Held objects are shared between all queries of this client. Disabled by default.
         """
 
         if hasattr(address, "get_address"):
@@ -127,50 +284,115 @@ class FractalClient(object):
             self._headers["Authorization"] = json.dumps({"username": username, "password": password})
 
         from . import __version__  # Import here to avoid circular import
-        from . import _isportal
 
         self._headers["Content-Type"] = f"application/{self.encoding}"
         self._headers["User-Agent"] = f"qcportal/{__version__}"
 
         self._request_counter: DefaultDict[Tuple[str, str], int] = defaultdict(int)
+        self.metrics = ClientMetrics()
+
+        # A single session holds the connection pool, so that the TCP/TLS handshake is paid once
+        # rather than on every request
+        self._keep_alive = keep_alive
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        if not keep_alive:
+            self._headers["Connection"] = "close"
+
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.max_workers = max_workers
+
+        if compression == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ImportError(
+                    "zstd compression requires zstandard, please install it with `pip install zstandard` "
+                    "or `conda install zstandard -c conda-forge`."
+                )
+        elif compression not in {None, "gzip"}:
+            raise KeyError("Compression not understood: '{}'".format(compression))
+        self._compression = compression
+        self._compression_threshold = compression_threshold
+
+        # Advertise every response encoding urllib3 can decode (gzip, deflate, and br/zstd if installed)
+        self._headers["Accept-Encoding"] = make_headers(accept_encoding=True)["accept-encoding"]
+        self._transfer_counter: DefaultDict[str, int] = defaultdict(int)
+        self._transfer_lock = threading.Lock()
+
+        self._disk_cache: Optional[DiskCache] = None
+        if cache_dir is not None:
+            os.makedirs(os.path.expanduser(cache_dir), exist_ok=True)
+            self._disk_cache = DiskCache(cache_dir, max_size=cache_max_size)
+
+        self._identity_map: Optional[IdentityMap] = None
+        if identity_map_size:
+            self._identity_map = IdentityMap(max_entries=identity_map_size)
+
+        self._coalesce_window = coalesce_window
+        self._coalescers: Dict[str, RequestCoalescer] = {}
+        self._coalescer_lock = threading.Lock()
+
+        if server_info_ttl is not None and self._disk_cache is None:
+            raise ValueError("Caching the server information with server_info_ttl requires a cache_dir.")
+        self._server_info_ttl = server_info_ttl
+        self._trusted_server = trusted_server
+        self._server_info: Optional[Dict[str, Any]] = None
+        self._query_limit: Optional[int] = None
+        self._connect_lock = threading.Lock()
 
         ### Define all attributes before this line
 
-        # Try to connect and pull general data
-        self.server_info = self._automodel_request("information", "get", {}, full_return=True).dict()
+        if not lazy:
+            self._connect()
 
-        self.server_name = self.server_info["name"]
-        self.query_limit: int = self.server_info["query_limit"]
+    def _connect(self) -> None:
+        """Pulls general data from the server, or from the on-disk cache if still fresh, and checks versions"""
+        from . import _isportal
 
-        if _isportal:
-            try:
-                server_version_min_client = _version_list(self.server_info["client_lower_version_limit"])[:2]
-                server_version_max_client = _version_list(self.server_info["client_upper_version_limit"])[:2]
-            except KeyError:
-                server_ver_str = ".".join([str(i) for i in self.server_info["version"]])
-                raise IOError(
-                    f"The Server at {self.address}, version {self.server_info['version']} does not report "
-                    f"what Client versions it accepts! It can be almost asserted your Client is too new for "
-                    f"the Server you are connecting to. Please downgrade your Client with "
-                    f"the one of following commands (pip or conda):"
-                    f"\n\t- pip install qcportal=={server_ver_str}"
-                    f"\n\t- conda install -c conda-forge qcportal=={server_ver_str}"
-                    f"\n(Only MAJOR.MINOR versions are checked)"
-                )
-            client_version = _version_list(__version__)[:2]
-            if not server_version_min_client <= client_version <= server_version_max_client:
-                client_ver_str = ".".join([str(i) for i in client_version])
-                server_version_min_str = ".".join([str(i) for i in server_version_min_client])
-                server_version_max_str = ".".join([str(i) for i in server_version_max_client])
-                raise IOError(
-                    f"This Client of version {client_ver_str} does not fall within the Server's allowed "
-                    f"Client versions of [{server_version_min_str}, {server_version_max_str}] at "
-                    f"Server address: {self.address}. Please change your Client version with one of the "
-                    f"following commands:"
-                    f"\n\t- pip install qcportal=={server_version_max_str}.*"
-                    f"\n\t- conda install -c conda-forge qcportal=={server_version_max_str}.*"
-                    f"\n(Only MAJOR.MINOR versions are checked and shown)"
-                )
+        with self._connect_lock:
+            if self._server_info is not None:
+                return
+
+            server_info = None
+            if self._server_info_ttl is not None:
+                server_info = self._disk_cache.get_server_info(self.address, self._server_info_ttl)
+
+            if server_info is None:
+                server_info = self._automodel_request("information", "get", {}, full_return=True).dict()
+                if self._server_info_ttl is not None:
+                    self._disk_cache.put_server_info(self.address, server_info)
+
+            if _isportal:
+                _check_client_version(server_info, self.address)
+
+            self._query_limit = server_info["query_limit"]
+            self._server_info = server_info
+
+    @property
+    def server_info(self) -> Dict[str, Any]:
+        if self._server_info is None:
+            self._connect()
+        return self._server_info
+
+    @property
+    def server_name(self) -> str:
+        return self.server_info["name"]
+
+    @property
+    def query_limit(self) -> int:
+        if self._server_info is None:
+            self._connect()
+        return self._query_limit
+
+    @query_limit.setter
+    def query_limit(self, value: int) -> None:
+        if self._server_info is None:
+            self._connect()
+        self._query_limit = value
 
     def __repr__(self) -> str:
         """A short representation of the current FractalClient.
@@ -180,11 +402,37 @@ class FractalClient(object):
         str
             The desired representation.
         """
+        # Do not connect a lazy client just to show it
+        server_name = self._server_info["name"] if self._server_info is not None else None
         ret = "FractalClient(server_name='{}', address='{}', username='{}')".format(
-            self.server_name, self.address, self.username
+            server_name, self.address, self.username
         )
         return ret
 
+    def __enter__(self) -> "FractalClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FractalClient":
+        # Records hold a reference to their client, copies of them share the same connection
+        return self
+
+    def close(self) -> None:
+        """Closes all pooled connections to the server.
+
+        The client remains usable, new connections are opened on the next request.
+        """
+        self._session.close()
+
+    def clear_cache(self) -> None:
+        """Removes all objects from the in-memory identity map and the on-disk cache, if enabled."""
+        if self._identity_map is not None:
+            self._identity_map.clear()
+        if self._disk_cache is not None:
+            self._disk_cache.clear()
+
     def _repr_html_(self) -> str:
 
         return f"""
@@ -205,40 +453,62 @@ class FractalClient(object):
         method: str,
         service: str,
         *,
-        data: Optional[str] = None,
+        data: Optional[Union[str, bytes]] = None,
         noraise: bool = False,
         timeout: Optional[int] = None,
     ) -> requests.Response:
 
         addr = self.address + service
-        kwargs = {"data": data, "timeout": timeout, "headers": self._headers, "verify": self._verify}
+        headers = self._headers
+
+        if data is not None:
+            # JSON bodies are text, count and compress their encoded bytes
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+
+            nbytes = len(data)
+            if self._compression is not None and nbytes >= self._compression_threshold:
+                data = _compress_body(data, self._compression)
+                headers = {**headers, "Content-Encoding": self._compression}
+
+            with self._transfer_lock:
+                self._transfer_counter["request_bytes"] += nbytes
+                self._transfer_counter["request_bytes_sent"] += len(data)
+
+        kwargs = {"data": data, "timeout": timeout, "headers": headers, "verify": self._verify}
 
         if self._mock_network_error:
             raise requests.exceptions.RequestException("mock_network_error is on, failing by design!")
 
+        if method not in {"get", "post", "put", "delete"}:
+            raise KeyError("Method not understood: '{}'".format(method))
+
         try:
-            if method == "get":
-                r = requests.get(addr, **kwargs)
-            elif method == "post":
-                r = requests.post(addr, **kwargs)
-            elif method == "put":
-                r = requests.put(addr, **kwargs)
-            elif method == "delete":
-                r = requests.delete(addr, **kwargs)
-            else:
-                raise KeyError("Method not understood: '{}'".format(method))
+            r = self._session.request(method.upper(), addr, **kwargs)
         except requests.exceptions.SSLError:
             raise ConnectionRefusedError(_ssl_error_msg) from None
         except requests.exceptions.ConnectionError:
             raise ConnectionRefusedError(_connection_error_msg.format(self.address)) from None
 
+        # Body as decoded by urllib3 and as read off the wire, which differ for compressed responses
+        received = r.raw.tell() if r.raw is not None else len(r.content)
+        with self._transfer_lock:
+            self._transfer_counter["response_bytes"] += len(r.content)
+            self._transfer_counter["response_bytes_received"] += received
+
         if (r.status_code != 200) and (not noraise):
             raise IOError("Server communication failure. Reason: {}".format(r.reason))
 
         return r
 
     def _automodel_request(
-        self, name: str, rest: str, payload: Dict[str, Any], full_return: bool = False, timeout: int = None
+        self,
+        name: str,
+        rest: str,
+        payload: Dict[str, Any],
+        full_return: bool = False,
+        timeout: int = None,
+        build: Optional[Callable[[Any], None]] = None,
     ) -> Any:
         """Automatic model request profiling and creation using rest_models
 
@@ -254,6 +524,8 @@ class FractalClient(object):
             Returns the full server response if True that contains additional metadata.
         timeout : int, optional
             Timeout time
+        build : Optional[Callable[[Any], None]], optional
+            Builds the final objects of the response in place, the time spent is recorded as validation time
 
         Returns
         -------
@@ -261,25 +533,247 @@ class FractalClient(object):
             The REST response object
         """
         sname = name.strip("/")
-        self._request_counter[(sname, rest)] += 1
+        if self._server_info is None and sname != "information":
+            self._connect()
 
-        body_model, response_model = rest_model(sname, rest)
+        # Requests are made from worker threads by _chunked_map and _paginate
+        with self._transfer_lock:
+            self._request_counter[(sname, rest)] += 1
 
-        # Provide a reasonable traceback
-        try:
-            payload = body_model(**payload)
-        except ValidationError as exc:
-            raise TypeError(str(exc))
+        response_model, body = _encode_request(sname, rest, payload, self.encoding)
 
-        r = self._request(rest, name, data=payload.serialize(self.encoding), timeout=timeout)
-        encoding = r.headers["Content-Type"].split("/")[1]
-        response = response_model.parse_raw(r.content, encoding=encoding)
+        start = time.perf_counter()
+        latency, decode_time, validation_time, nbytes = 0.0, 0.0, 0.0, 0
+        try:
+            r = self._request(rest, name, data=body, timeout=timeout)
+            latency = time.perf_counter() - start
+            nbytes = len(r.content)
+            response, decode_time, validation_time = _decode_response(
+                response_model, r.content, r.headers["Content-Type"], validate=not self._trusted_server
+            )
+            if build is not None:
+                build_start = time.perf_counter()
+                build(response)
+                validation_time += time.perf_counter() - build_start
+        except Exception:
+            latency = latency or time.perf_counter() - start
+            self.metrics.record(
+                sname, rest, latency=latency, bytes_sent=len(body), bytes_received=nbytes, error=True
+            )
+            raise
+
+        self.metrics.record(
+            sname,
+            rest,
+            latency=latency,
+            bytes_sent=len(body),
+            bytes_received=nbytes,
+            decode_time=decode_time,
+            validation_time=validation_time,
+        )
 
         if full_return:
             return response
         else:
             return response.data
 
+    def _chunked_map(
+        self, func: Callable[[List[Any]], Any], items: List[Any], chunk_size: Optional[int] = None
+    ) -> List[Any]:
+        """Applies a function to sequential chunks of a list, concurrently if ``max_workers`` allows.
+
+        Parameters
+        ----------
+        func : Callable[[List[Any]], Any]
+            The function to call on each chunk, typically a query or add request
+        items : List[Any]
+            The items to split into chunks
+        chunk_size : Optional[int], optional
+            The size of each chunk, defaults to the server ``query_limit``
+
+        Returns
+        -------
+        List[Any]
+            The result of each call in the same order as the chunks
+        """
+        if chunk_size is None:
+            chunk_size = self.query_limit
+
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        workers = min(self.max_workers, len(chunks))
+        if workers <= 1:
+            return [func(chunk) for chunk in chunks]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(func, chunks))
+
+    def _query_by_id(
+        self, kind: str, id: "QueryObjectId", fetch: Callable[[List[str]], List[Any]]
+    ) -> List[Any]:
+        """Serves an id-only query from the identity map and the on-disk cache, fetching only missing ids
+        from the server.
+
+        Parameters
+        ----------
+        kind : str
+            The type of object being queried, such as "molecule" or "result"
+        id : QueryObjectId
+            The ids to query
+        fetch : Callable[[List[str]], List[Any]]
+            Fetches the given ids from the server
+
+        Returns
+        -------
+        List[Any]
+            The found objects in the order of the requested ids
+        """
+        ids = list(dict.fromkeys(str(x) for x in (id if isinstance(id, (list, tuple)) else [id])))
+
+        found = {}
+        if self._identity_map is not None:
+            found.update(self._identity_map.get(kind, ids))
+
+        missing = [x for x in ids if x not in found]
+        if missing and self._disk_cache is not None:
+            cached = list(self._disk_cache.get(self.address, kind, missing).values())
+            if kind != "molecule":
+                for obj in cached:
+                    obj.__dict__["client"] = self
+            found.update((x.id, x) for x in self._canonicalize(kind, cached))
+
+            missing = [x for x in ids if x not in found]
+
+        if missing:
+            # Already canonicalized by the underlying query
+            fetched = fetch(missing)
+
+            if self._disk_cache is not None:
+                self._disk_cache.put(self.address, kind, [x for x in fetched if self._is_immutable(kind, x)])
+            found.update((x.id, x) for x in fetched)
+
+        return [found[x] for x in ids if x in found]
+
+    @staticmethod
+    def _is_immutable(kind: str, obj: Any) -> bool:
+        # Molecules are immutable, records only once they are complete
+        return kind == "molecule" or obj.status == "COMPLETE"
+
+    def _canonicalize(self, kind: str, objects: List[Any]) -> List[Any]:
+        """Replaces objects by the instance held in the identity map, holding new immutable ones.
+
+        Parameters
+        ----------
+        kind : str
+            The type of object, such as "molecule" or "result"
+        objects : List[Any]
+            The objects returned by a query
+
+        Returns
+        -------
+        List[Any]
+            The objects in the same order, already known ids replaced by their shared instance
+        """
+        if self._identity_map is None:
+            return objects
+
+        ret = list(objects)
+        idx = [i for i, x in enumerate(ret) if self._is_immutable(kind, x)]
+        for i, obj in zip(idx, self._identity_map.canonicalize(kind, [ret[i] for i in idx])):
+            ret[i] = obj
+        return ret
+
+    def _coalesced_get(self, kind: str, id: "ObjectId") -> Any:
+        """Fetches a single object by id, batching concurrent lookups of the same kind into one query.
+
+        Parameters
+        ----------
+        kind : str
+            The type of object, one of {"molecule", "kvstore"}
+        id : ObjectId
+            The id of the object
+
+        Returns
+        -------
+        Any
+            The requested object
+        """
+        if self._identity_map is not None:
+            held = self._identity_map.get(kind, [id])
+            if held:
+                return held[id]
+
+        with self._coalescer_lock:
+            coalescer = self._coalescers.get(kind)
+            if coalescer is None:
+                if kind == "molecule":
+                    fetch = lambda ids: {x.id: x for x in self.query_molecules(id=ids)}
+                elif kind == "kvstore":
+                    fetch = lambda ids: self.query_kvstore(ids)
+                else:
+                    raise KeyError("Coalesced lookups are not supported for '{}'".format(kind))
+
+                coalescer = RequestCoalescer(fetch, self.query_limit, window=self._coalesce_window)
+                self._coalescers[kind] = coalescer
+
+        return coalescer.get(id)
+
+    def _paginate(
+        self, query: Callable[..., List[Any]], page_size: Optional[int], batched: bool, kwargs: Dict[str, Any]
+    ) -> Iterator[Any]:
+        """Pages through a query with limit/skip while the next page is fetched in the background.
+
+        Parameters
+        ----------
+        query : Callable[..., List[Any]]
+            The query function, must accept ``limit`` and ``skip``
+        page_size : Optional[int]
+            The number of objects per page, defaults to (and is capped by) the server ``query_limit``
+        batched : bool
+            Yields whole pages if True, otherwise yields objects one by one
+        kwargs : Dict[str, Any]
+            Additional query arguments
+
+        Returns
+        -------
+        Iterator[Any]
+            The objects or pages of objects found by the query
+        """
+        for key in ("limit", "skip", "full_return"):
+            if key in kwargs:
+                raise KeyError(f"Iterating queries do not accept the '{key}' argument.")
+
+        if page_size is None:
+            page_size = self.query_limit
+        page_size = min(page_size, self.query_limit)
+
+        # A single background worker keeps at most one page in flight ahead of the consumer
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = None
+        try:
+            skip = 0
+            future = executor.submit(query, limit=page_size, skip=skip, **kwargs)
+            while future is not None:
+                page = future.result()
+
+                skip += len(page)
+                if len(page) < page_size:
+                    future = None
+                else:
+                    future = executor.submit(query, limit=page_size, skip=skip, **kwargs)
+
+                if len(page) == 0:
+                    break
+                elif batched:
+                    yield page
+                else:
+                    yield from page
+        finally:
+            # Closed early, a prefetch which has not started yet is never sent and a running one is not waited on
+            if future is not None:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @classmethod
     def from_file(cls, load_path: Optional[str] = None) -> "FractalClient":
         """Creates a new FractalClient from file. If no path is passed in, the
@@ -347,6 +841,25 @@ class FractalClient(object):
         """
         return json.loads(json.dumps(self.server_info))
 
+    def transfer_statistics(self) -> Dict[str, Union[int, float]]:
+        """Returns the number of body bytes exchanged with the server before and after compression.
+
+        Returns
+        -------
+        Dict[str, Union[int, float]]
+            The uncompressed (``request_bytes``, ``response_bytes``) and on the wire (``request_bytes_sent``,
+            ``response_bytes_received``) byte counts together with the overall compression ratio.
+        """
+        with self._transfer_lock:
+            ret = {
+                k: self._transfer_counter[k]
+                for k in ("request_bytes", "request_bytes_sent", "response_bytes", "response_bytes_received")
+            }
+
+        wire = ret["request_bytes_sent"] + ret["response_bytes_received"]
+        ret["compression_ratio"] = (ret["request_bytes"] + ret["response_bytes"]) / wire if wire else 1.0
+        return ret
+
     ### KVStore section
 
     def query_kvstore(self, id: "QueryObjectId", full_return: bool = False) -> Dict[str, Any]:
@@ -367,6 +880,180 @@ class FractalClient(object):
 
         return self._automodel_request("kvstore", "get", {"meta": {}, "data": {"id": id}}, full_return=full_return)
 
+    def get_outputs(
+        self,
+        records: List["RecordBase"],
+        fields: Sequence[str] = ("stdout", "stderr", "error"),
+        workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Fetches and decompresses the outputs of many records at once and stores them in each record's cache.
+
+        KVStore entries are requested in ``query_limit`` chunks rather than one request per record and
+        field, and are decompressed in a thread pool (gzip, bzip2 and lzma release the GIL). Subsequent
+        calls such as ``record.get_stdout()`` are served from the cache.
+
+        Parameters
+        ----------
+        records : List[RecordBase]
+            The records to fetch the outputs of
+        fields : Sequence[str], optional
+            The outputs to fetch, any of {"stdout", "stderr", "error"}
+        workers : Optional[int], optional
+            The number of decompression threads, defaults to the number of CPUs
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The requested outputs of each record in {field: output} format, in the order of ``records``.
+            The error is a dictionary, stdout and stderr are strings. Missing outputs are None.
+        """
+
+        unknown = set(fields) - {"stdout", "stderr", "error"}
+        if unknown:
+            raise KeyError(f"Output fields not understood: {sorted(unknown)}.")
+
+        # (record, field, kvstore id) of every output which is not cached yet
+        needed = [
+            (record, field, record.__dict__[field])
+            for record in records
+            for field in fields
+            if (record.__dict__[field] is not None) and (field not in record.cache)
+        ]
+
+        kv_ids = list(dict.fromkeys(oid for _, _, oid in needed))
+        kvstores = {}
+        for chunk in self._chunked_map(self.query_kvstore, kv_ids):
+            kvstores.update(chunk)
+
+        # Errors are stored as JSON, everything else as plain strings
+        decode = list(dict.fromkeys((oid, field == "error") for _, field, oid in needed if oid in kvstores))
+
+        def decompress(item: Tuple[str, bool]) -> Any:
+            oid, as_json = item
+            return kvstores[oid].get_json() if as_json else kvstores[oid].get_string()
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if min(workers, len(decode)) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                decoded = dict(zip(decode, executor.map(decompress, decode)))
+        else:
+            decoded = {item: decompress(item) for item in decode}
+
+        for record, field, oid in needed:
+            item = (oid, field == "error")
+            if item in decoded:
+                record.cache[field] = decoded[item]
+
+        return [{field: record.cache.get(field, None) for field in fields} for record in records]
+
+    def get_wavefunctions(
+        self, records: List["ResultRecord"], keys: Union[str, List[str]], filename: Optional[str] = None
+    ) -> Optional[List[Optional[Dict[str, Any]]]]:
+        """Fetches Wavefunction data of many ResultRecords, with matrices decoded into NumPy arrays.
+
+        The wavefunction store is queried by a single id, so one projected request is made per record.
+        These requests are issued concurrently up to ``max_workers``. Keys are translated through each
+        record's ``return_map`` as in ``ResultRecord.get_wavefunction``.
+
+        Parameters
+        ----------
+        records : List[ResultRecord]
+            The records to fetch the wavefunctions of
+        keys : Union[str, List[str]]
+            The wavefunction keys to fetch, such as "orbitals_a" or "scf_density_a"
+        filename : Optional[str], optional
+            If given, writes each wavefunction into this HDF5 file as it arrives (one group per record id)
+            instead of keeping them in memory and in the record caches.
+
+        Returns
+        -------
+        Optional[List[Optional[Dict[str, Any]]]]
+            The requested data of each record in {key: value} format in the order of ``records``, None for
+            records without wavefunction data. Returns None if ``filename`` is given.
+        """
+        import numpy as np
+        import qcelemental as qcel
+
+        if isinstance(keys, str):
+            keys = [keys]
+        keys = [x.lower() for x in keys]
+
+        # Validate all records before any request is made
+        todo = []
+        for record in records:
+            if record.wavefunction is None:
+                continue
+
+            mapped = {record.wavefunction["return_map"].get(x, x) for x in keys}
+            unknown = mapped - set(record.wavefunction["available"] + ["basis", "restricted"])
+            if unknown:
+                raise KeyError(
+                    f"Wavefunction Key(s) `{unknown}` not understood for record {record.id}, "
+                    f"available keys are: {record.wavefunction['available']}"
+                )
+
+            cached = record.cache.get("wavefunction", {})
+            todo.append((record, sorted(mapped - cached.keys())))
+
+        def fetch(item: Tuple["ResultRecord", List[str]]) -> Dict[str, Any]:
+            record, missing = item
+            if not missing:
+                return {}
+
+            data = self.custom_query(
+                "wavefunctionstore", None, {"id": record.wavefunction_data_id}, meta={"include": missing}
+            )
+
+            for k, v in data.items():
+                if k == "basis":
+                    data[k] = qcel.models.BasisSet(**v)
+                elif isinstance(v, (list, np.ndarray)):
+                    data[k] = np.asarray(v)
+            return data
+
+        workers = min(self.max_workers, len(todo))
+        if workers > 1:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            results = executor.map(fetch, todo)
+        else:
+            executor = None
+            results = map(fetch, todo)
+
+        try:
+            if filename is None:
+                for (record, _), data in zip(todo, results):
+                    record.cache.setdefault("wavefunction", {}).update(data)
+            else:
+                import h5py
+
+                with h5py.File(filename, "a") as f:
+                    for (record, _), data in zip(todo, results):
+                        data = {**record.cache.get("wavefunction", {}), **data}
+                        group = f.require_group(str(record.id))
+                        for k in keys:
+                            value = data.get(record.wavefunction["return_map"].get(k, k), None)
+                            if k in group:
+                                del group[k]
+                            if isinstance(value, np.ndarray):
+                                group.create_dataset(k, data=value)
+                            elif value is not None:
+                                group.attrs[k] = value.json() if k == "basis" else json.dumps(value)
+                return None
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        ret = []
+        for record in records:
+            if record.wavefunction is None:
+                ret.append(None)
+            else:
+                cached = record.cache["wavefunction"]
+                ret.append({k: cached.get(record.wavefunction["return_map"].get(k, k), None) for k in keys})
+        return ret
+
     ### Molecule section
 
     def query_molecules(
@@ -402,12 +1089,46 @@ class FractalClient(object):
             A list of found molecules.
         """
 
+        if (
+            (self._disk_cache is not None or self._identity_map is not None)
+            and id is not None
+            and (molecule_hash, molecular_formula, limit, skip, full_return) == (None, None, None, 0, False)
+        ):
+            return self._query_by_id("molecule", id, lambda ids: self.query_molecules(id=ids, full_return=True).data)
+
         payload = {
             "meta": {"limit": limit, "skip": skip},
             "data": {"id": id, "molecule_hash": molecule_hash, "molecular_formula": molecular_formula},
         }
-        response = self._automodel_request("molecule", "get", payload, full_return=full_return)
-        return response
+        response = self._automodel_request("molecule", "get", payload, full_return=True)
+        response.data[:] = self._canonicalize("molecule", response.data)
+
+        if full_return:
+            return response
+        else:
+            return response.data
+
+    def iter_molecules(self, page_size: Optional[int] = None, batched: bool = False, **kwargs) -> Iterator[Any]:
+        """Iterates over all Molecules matching a query, paging through the server transparently.
+
+        Pages are requested with ``limit``/``skip`` and the next page is prefetched in the background
+        while the current one is consumed, so only about two pages are held in memory at any time.
+
+        Parameters
+        ----------
+        page_size : Optional[int], optional
+            The number of Molecules per request, defaults to the server ``query_limit``
+        batched : bool, optional
+            Yields lists of Molecules (one per page) if True, otherwise yields them one by one.
+        **kwargs
+            Query arguments as accepted by ``query_molecules`` except ``limit``, ``skip`` and ``full_return``.
+
+        Returns
+        -------
+        Iterator[Any]
+            The Molecules found by the query, or pages of them if ``batched``.
+        """
+        return self._paginate(self.query_molecules, page_size, batched, kwargs)
 
     def add_molecules(self, mol_list: List["Molecule"], full_return: bool = False) -> List[str]:
         """Adds molecules to the Server.
@@ -489,7 +1210,7 @@ class FractalClient(object):
         group: Optional[str] = "default",
         show_hidden: bool = False,
         tag: Optional[Union[str, List[str]]] = None,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Lists the available collections currently on the server.
 
         Parameters
@@ -512,6 +1233,10 @@ class FractalClient(object):
             A dataframe containing the collection, name, and tagline.
         """
 
+        import pandas as pd
+
+        from .collections import collections_name_map
+
         query: Dict[str, str] = {}
         if collection_type is not None:
             query = {"collection": collection_type.lower()}
@@ -595,6 +1320,8 @@ class FractalClient(object):
         if full_return:
             return response
 
+        from .collections import collection_factory
+
         # Watching for nothing found
         if len(response.data):
             return collection_factory(response.data[0], client=self)
@@ -701,6 +1428,17 @@ class FractalClient(object):
             Returns a List of found RecordResult's without include, or a
             dictionary of results with include.
         """
+        if (
+            (self._disk_cache is not None or self._identity_map is not None)
+            and id is not None
+            and status in (None, "COMPLETE", ["COMPLETE"])
+            and (task_id, program, molecule, driver, method, basis, keywords) == (None,) * 7
+            and (limit, skip, include, full_return) == (None, 0, None, False)
+        ):
+            return self._query_by_id(
+                "result", id, lambda ids: self.query_results(id=ids, status=status, full_return=True).data
+            )
+
         payload = {
             "meta": {"limit": limit, "skip": skip, "include": include},
             "data": {
@@ -721,12 +1459,35 @@ class FractalClient(object):
         if not include:
             for result in response.data:
                 result.__dict__["client"] = self
+            response.data[:] = self._canonicalize("result", response.data)
 
         if full_return:
             return response
         else:
             return response.data
 
+    def iter_results(self, page_size: Optional[int] = None, batched: bool = False, **kwargs) -> Iterator[Any]:
+        """Iterates over all ResultRecords matching a query, paging through the server transparently.
+
+        Pages are requested with ``limit``/``skip`` and the next page is prefetched in the background
+        while the current one is consumed, so only about two pages are held in memory at any time.
+
+        Parameters
+        ----------
+        page_size : Optional[int], optional
+            The number of ResultRecords per request, defaults to the server ``query_limit``
+        batched : bool, optional
+            Yields lists of ResultRecords (one per page) if True, otherwise yields them one by one.
+        **kwargs
+            Query arguments as accepted by ``query_results`` except ``limit``, ``skip`` and ``full_return``.
+
+        Returns
+        -------
+        Iterator[Any]
+            The ResultRecords found by the query, or pages of them if ``batched``.
+        """
+        return self._paginate(self.query_results, page_size, batched, kwargs)
+
     def query_procedures(
         self,
         id: Optional["QueryObjectId"] = None,
@@ -772,6 +1533,17 @@ class FractalClient(object):
             dictionary of results with include.
         """
 
+        if (
+            (self._disk_cache is not None or self._identity_map is not None)
+            and id is not None
+            and status in (None, "COMPLETE", ["COMPLETE"])
+            and (task_id, procedure, program, hash_index) == (None,) * 4
+            and (limit, skip, include, full_return) == (None, 0, None, False)
+        ):
+            return self._query_by_id(
+                "procedure", id, lambda ids: self.query_procedures(id=ids, status=status, full_return=True).data
+            )
+
         payload = {
             "meta": {"limit": limit, "skip": skip, "include": include},
             "data": {
@@ -783,17 +1555,47 @@ class FractalClient(object):
                 "status": status,
             },
         }
-        response = self._automodel_request("procedure", "get", payload, full_return=True)
 
-        if not include:
+        def build(response):
             for ind in range(len(response.data)):
-                response.data[ind] = build_procedure(response.data[ind], client=self)
+                response.data[ind] = build_procedure(
+                    response.data[ind], client=self, validate=not self._trusted_server
+                )
+
+        response = self._automodel_request(
+            "procedure", "get", payload, full_return=True, build=None if include else build
+        )
+
+        if not include:
+            response.data[:] = self._canonicalize("procedure", response.data)
 
         if full_return:
             return response
         else:
             return response.data
 
+    def iter_procedures(self, page_size: Optional[int] = None, batched: bool = False, **kwargs) -> Iterator[Any]:
+        """Iterates over all Procedures matching a query, paging through the server transparently.
+
+        Pages are requested with ``limit``/``skip`` and the next page is prefetched in the background
+        while the current one is consumed, so only about two pages are held in memory at any time.
+
+        Parameters
+        ----------
+        page_size : Optional[int], optional
+            The number of Procedures per request, defaults to the server ``query_limit``
+        batched : bool, optional
+            Yields lists of Procedures (one per page) if True, otherwise yields them one by one.
+        **kwargs
+            Query arguments as accepted by ``query_procedures`` except ``limit``, ``skip`` and ``full_return``.
+
+        Returns
+        -------
+        Iterator[Any]
+            The Procedures found by the query, or pages of them if ``batched``.
+        """
+        return self._paginate(self.query_procedures, page_size, batched, kwargs)
+
     ### Compute section
 
     def add_compute(
@@ -1013,6 +1815,28 @@ class FractalClient(object):
 
         return self._automodel_request("task_queue", "get", payload, full_return=full_return)
 
+    def iter_tasks(self, page_size: Optional[int] = None, batched: bool = False, **kwargs) -> Iterator[Any]:
+        """Iterates over all Tasks matching a query, paging through the server transparently.
+
+        Pages are requested with ``limit``/``skip`` and the next page is prefetched in the background
+        while the current one is consumed, so only about two pages are held in memory at any time.
+
+        Parameters
+        ----------
+        page_size : Optional[int], optional
+            The number of Tasks per request, defaults to the server ``query_limit``
+        batched : bool, optional
+            Yields lists of Tasks (one per page) if True, otherwise yields them one by one.
+        **kwargs
+            Query arguments as accepted by ``query_tasks`` except ``limit``, ``skip`` and ``full_return``.
+
+        Returns
+        -------
+        Iterator[Any]
+            The Tasks found by the query, or pages of them if ``batched``.
+        """
+        return self._paginate(self.query_tasks, page_size, batched, kwargs)
+
     def modify_tasks(
         self,  # lgtm [py/similar-function]
         operation: str,
@@ -0,0 +1,105 @@
+"""
+Batches concurrent single-object lookups into combined requests
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, List
+
+
+class RequestCoalescer:
+    """
+    Collects single-key lookups into batched fetches of up to ``batch_size`` keys.
+
+    Lookups for a key that is already pending or in flight wait on the same result rather than
+    issuing a second request. The first caller to find the coalescer idle fetches on behalf of
+    everyone: it optionally waits ``window`` seconds for more keys to arrive, then keeps fetching
+    batches until no keys are pending. Keys requested while a batch is in flight therefore form
+    the next batch, so a single thread pays no extra latency and many threads share requests.
+    """
+
+    def __init__(
+        self, fetch: Callable[[List[Hashable]], Dict[Hashable, Any]], batch_size: int, window: float = 0.0
+    ) -> None:
+        """
+        Parameters
+        ----------
+        fetch : Callable[[List[Hashable]], Dict[Hashable, Any]]
+            Fetches a list of keys, returning the found objects in {key: object} format
+        batch_size : int
+            The maximum number of keys per fetch
+        window : float, optional
+            The number of seconds to wait for further keys before fetching a new batch
+        """
+        self._fetch = fetch
+        self.batch_size = batch_size
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._futures: Dict[Hashable, Future] = {}
+        self._pending: List[Hashable] = []
+        self._running = False
+
+    def get(self, key: Hashable) -> Any:
+        """Returns the object of a single key
+
+        Parameters
+        ----------
+        key : Hashable
+            The key to look up
+
+        Returns
+        -------
+        Any
+            The fetched object
+
+        Raises
+        ------
+        KeyError
+            If the key was not found
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                future = self._futures[key] = Future()
+                self._pending.append(key)
+
+            leader = not self._running
+            self._running = True
+
+        if leader:
+            self._drain()
+
+        return future.result()
+
+    def _drain(self) -> None:
+        if self.window > 0:
+            time.sleep(self.window)
+
+        while True:
+            with self._lock:
+                if len(self._pending) == 0:
+                    self._running = False
+                    return
+
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+
+            try:
+                found = self._fetch(batch)
+                error = None
+            except BaseException as exc:
+                found = {}
+                error = exc
+
+            with self._lock:
+                futures = [self._futures.pop(key) for key in batch]
+
+            for key, future in zip(batch, futures):
+                if error is not None:
+                    future.set_exception(error)
+                elif key in found:
+                    future.set_result(found[key])
+                else:
+                    future.set_exception(KeyError(f"Object '{key}' was not found on the server."))
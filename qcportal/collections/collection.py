@@ -15,7 +15,7 @@ from ..models import ProtoModel
 
 if TYPE_CHECKING:  # pragma: no cover
     from .. import FractalClient
-    from ..models import ObjectId
+    from ..models import Molecule, ObjectId
 
 
 class Collection(abc.ABC):
@@ -266,10 +266,10 @@ class Collection(abc.ABC):
             flat_map_keys.append(k)
             flat_map_mols.append(v)
 
-        CHUNK_SIZE = client.query_limit
+        # Chunks are serialized and uploaded concurrently up to the client max_workers, results stay in order
         mol_ret = []
-        for i in range(0, len(flat_map_mols), CHUNK_SIZE):
-            mol_ret.extend(client.add_molecules(flat_map_mols[i : i + CHUNK_SIZE]))
+        for chunk in client._chunked_map(client.add_molecules, flat_map_mols):
+            mol_ret.extend(chunk)
 
         return {k: v for k, v in zip(flat_map_keys, mol_ret)}
 
@@ -292,8 +292,12 @@ class BaseProcedureDataset(Collection):
         class Config(Collection.DataModel.Config):
             pass
 
-    @abc.abstractmethod
     def _internal_compute_add(self, spec: Any, entry: Any, tag: str, priority: str) -> "ObjectId":
+        return self._internal_compute_add_many(spec, [entry], tag, priority)[0]
+
+    @abc.abstractmethod
+    def _internal_compute_add_many(self, spec: Any, entries: List[Any], tag: str, priority: str) -> List["ObjectId"]:
+        """Submits a specification for several entries in batched requests, returning ids in entry order"""
         pass
 
     def _pre_save_prep(self, client: "FractalClient") -> None:
@@ -303,6 +307,33 @@ class BaseProcedureDataset(Collection):
 
         return [x.name for x in self.data.records.values()]
 
+    def _prefetch_history(self, records: List[Any]) -> None:
+        """Fetches the optimization history of many service records in one chunked pass and fills their caches
+
+        Records without a history (e.g., OptimizationRecords) or with an already cached history are skipped.
+
+        Parameters
+        ----------
+        records : List[Any]
+            The records to prefetch the history of
+        """
+
+        records = [x for x in records if hasattr(x, "_history_ids") and x._history_key not in x.cache]
+        needed_ids = list(dict.fromkeys(oid for x in records for oid in x._history_ids()))
+        if len(needed_ids) == 0:
+            return
+
+        # Incomplete records have incomplete optimizations in their history
+        def query(ids):
+            return self.client.query_procedures(id=ids, status=None)
+
+        procedures = {}
+        for chunk in self.client._chunked_map(query, needed_ids):
+            procedures.update((x.id, x) for x in chunk)
+
+        for record in records:
+            record._set_history(procedures)
+
     def _add_specification(self, name: str, spec: Any, overwrite=False) -> None:
         """
         Parameters
@@ -413,6 +444,49 @@ class BaseProcedureDataset(Collection):
         if save:
             self.save()
 
+    def _check_entries_exist(self, names: List[str]) -> None:
+        """
+        Checks that none of the entries exist yet and that no name is given twice.
+        """
+
+        seen = set()
+        for name in names:
+            self._check_entry_exists(name)
+            if name.lower() in seen:
+                raise KeyError(f"Record {name} was given more than once.")
+            seen.add(name.lower())
+
+    @staticmethod
+    def _check_columns(names: List[str], **columns: Optional[List[Any]]) -> None:
+        """
+        Checks that every given column has one item per entry name.
+        """
+
+        for key, column in columns.items():
+            if (column is not None) and (len(column) != len(names)):
+                raise ValueError(f"'{key}' has {len(column)} items, but {len(names)} entry names were given.")
+
+    def _add_molecules_by_hash(self, molecules: List["Molecule"]) -> List["ObjectId"]:
+        """
+        Uploads each unique molecule once in parallel chunks, returning the ids in input order.
+        """
+
+        hashes = [mol.get_hash() for mol in molecules]
+        mol_ret = self._add_molecules_by_dict(self.client, dict(zip(hashes, molecules)))
+        return [mol_ret[x] for x in hashes]
+
+    def _add_entries(self, records: List[Any], save: bool) -> None:
+        """
+        Adds several entries to the records, saving the collection once
+        """
+
+        self._check_entries_exist([x.name for x in records])
+        for record in records:
+            self.data.records[record.name.lower()] = record
+
+        if save:
+            self.save()
+
     def get_entry(self, name: str) -> Any:
         """Obtains a record from the Dataset
 
@@ -482,7 +556,7 @@ class BaseProcedureDataset(Collection):
         if subset:
             subset = set(subset)
 
-        submitted = 0
+        entries = []
         for entry in self.data.records.values():
             if (subset is not None) and (entry.name not in subset):
                 continue
@@ -490,16 +564,20 @@ class BaseProcedureDataset(Collection):
             if spec.name in entry.object_map:
                 continue
 
-            entry.object_map[spec.name] = self._internal_compute_add(spec, entry, tag, priority)
-            submitted += 1
+            entries.append(entry)
+
+        if entries:
+            ids = self._internal_compute_add_many(spec, entries, tag, priority)
+            for entry, oid in zip(entries, ids):
+                entry.object_map[spec.name] = oid
 
         self.data.history.add(specification)
 
         # Nothing to save
-        if submitted:
+        if entries:
             self.save()
 
-        return submitted
+        return len(entries)
 
     def query(self, specification: str, force: bool = False) -> pd.Series:
         """Queries a given specification from the server
@@ -527,9 +605,8 @@ class BaseProcedureDataset(Collection):
 
         # Chunk up the queries
         procedures: List[Dict[str, Any]] = []
-        for i in range(0, len(query_ids), self.client.query_limit):
-            chunk_ids = query_ids[i : i + self.client.query_limit]
-            procedures.extend(self.client.query_procedures(id=chunk_ids))
+        for chunk in self.client._chunked_map(lambda ids: self.client.query_procedures(id=ids), query_ids):
+            procedures.extend(chunk)
 
         proc_lookup = {x.id: x for x in procedures}
 
@@ -619,7 +696,8 @@ class BaseProcedureDataset(Collection):
 
         mapper = self._get_procedure_ids(specs)
         reverse_map = {v: k for k, v in mapper.items()}
-        procedures = self.client.query_procedures(id=list(mapper.values()))
+        procedures = self.client.query_procedures(id=list(mapper.values()), status=None)
+        self._prefetch_history([x for x in procedures if x.status != "COMPLETE"])
 
         data = []
 
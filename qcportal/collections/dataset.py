@@ -5,7 +5,7 @@ import gzip
 import tempfile
 import warnings
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -13,13 +13,13 @@ import requests
 from pydantic import Field, validator
 from qcelemental import constants
 from qcelemental.models.types import Array
-from tqdm import tqdm
 
 from ..models import Citation, ComputeResponse, ObjectId, ProtoModel
 from ..statistics import wrap_statistics
 from ..visualization import bar_plot, violin_plot
 from .collection import Collection
 from .collection_utils import composition_planner, register_collection
+from .value_store import ValueStore
 
 if TYPE_CHECKING:  # pragma: no cover
     from .. import FractalClient
@@ -59,11 +59,81 @@ class ContributedValues(ProtoModel):
     @validator("values")
     def _make_array(cls, v):
         if isinstance(v, (list, tuple)) and isinstance(v[0], (float, int, str, bool)):
-            v = np.array(v)
+            v = np.asarray(v)
 
         return v
 
 
+class _EntryIndex:
+    """
+    The unrolled entry index of a Dataset, one row per (entry, molecule).
+
+    Rows are kept as plain column lists with name -> rows and optional value -> rows maps, so subset lookups
+    only touch the requested rows. Records are only ever appended, so the index is extended in place while
+    the records list is the same object and rebuilt when it is replaced.
+    """
+
+    def __init__(self, columns: Tuple[str, ...], group_by: Tuple[str, ...] = ()) -> None:
+        self.columns: Dict[str, List[Any]] = {column: [] for column in columns}
+        self.rows: Dict[str, List[int]] = {}
+        self.record_positions: Dict[str, List[int]] = {}
+        self.groups: Dict[str, Dict[Any, List[int]]] = {column: {} for column in group_by}
+
+        self.records: Optional[List[Any]] = None
+        self.num_records = 0
+
+    def is_current(self, records: List[Any]) -> bool:
+        return records is self.records and len(records) == self.num_records
+
+    def extend(self, records: List[Any], unroll: Any) -> None:
+        """Adds the rows of all records beyond those already indexed"""
+        nrows = len(self.columns["name"])
+        group_positions = [(list(self.columns).index(column), groups) for column, groups in self.groups.items()]
+        for position in range(self.num_records, len(records)):
+            record = records[position]
+            self.record_positions.setdefault(record.name, []).append(position)
+
+            for row in unroll(record):
+                for column, value in zip(self.columns, row):
+                    self.columns[column].append(value)
+
+                self.rows.setdefault(record.name, []).append(nrows)
+                for column_position, groups in group_positions:
+                    groups.setdefault(row[column_position], []).append(nrows)
+                nrows += 1
+
+        self.records = records
+        self.num_records = len(records)
+
+    def select(self, subset: Optional[Union[str, Iterable[str]]] = None, **where: Iterable[Any]) -> List[int]:
+        """Returns the rows of the subset entries whose grouped columns take one of the given values"""
+        if isinstance(subset, str):
+            subset = [subset]
+
+        if subset is None:
+            rows = range(len(self.columns["name"]))
+        else:
+            rows = [row for name in subset for row in self.rows[name]]
+
+        for column, values in where.items():
+            groups = self.groups[column]
+            matched = set(row for value in values for row in groups.get(value, []))
+            if subset is None:
+                rows = sorted(matched)
+            else:
+                rows = [row for row in rows if row in matched]
+
+        return list(rows)
+
+    def frame(self, rows: Optional[List[int]] = None) -> pd.DataFrame:
+        """Builds a DataFrame of the given rows, labeled by their row number"""
+        if rows is None:
+            return pd.DataFrame(self.columns, columns=list(self.columns))
+
+        data = {column: [values[row] for row in rows] for column, values in self.columns.items()}
+        return pd.DataFrame(data, index=pd.Index(rows, name="index"), columns=list(self.columns))
+
+
 class Dataset(Collection):
     """
     The Dataset class for homogeneous computations on many molecules.
@@ -110,9 +180,12 @@ class Dataset(Collection):
             self._view = RemoteView(client, self.data.id)
         self._disable_view: bool = False  # for debugging and testing
         self._disable_query_limit: bool = False  # for debugging and testing
+        self._entry_index_cache: Optional[_EntryIndex] = None
 
-        # Initialize internal data frames and load in contrib
-        self.df = pd.DataFrame()
+        # Initialize internal value store and load in contrib
+        self._value_store = ValueStore()
+        self._df: Optional[pd.DataFrame] = None
+        self._df_columns: List[str] = []
         self._column_metadata: Dict[str, Any] = {}
 
         # If this is a brand new dataset, initialize the records and cv fields
@@ -187,6 +260,8 @@ class Dataset(Collection):
         pbar = None
         if progress_bar:
             try:
+                from tqdm import tqdm
+
                 file_length = int(r.headers.get("content-length"))
                 pbar = tqdm(total=file_length, initial=0, unit="B", unit_scale=True)
             except Exception:
@@ -259,18 +334,34 @@ class Dataset(Collection):
         self.data.__dict__["records"] = response.data.records
         self.data.__dict__["contributed_values"] = response.data.contributed_values
 
-    def _entry_index(self, subset: Optional[List[str]] = None) -> pd.DataFrame:
-        # TODO: make this fast for subsets
+    _entry_index_columns: Tuple[str, ...] = ("name", "molecule_id")
+    _entry_index_groups: Tuple[str, ...] = ()
+
+    @staticmethod
+    def _unroll_entry(entry: Any) -> List[Tuple[Any, ...]]:
+        return [(entry.name, entry.molecule_id)]
+
+    def _get_entry_index(self) -> _EntryIndex:
+        """Returns the entry index, extended or rebuilt only when the records have changed"""
         if self.data.records is None:
             self._get_data_records_from_db()
 
-        ret = pd.DataFrame(
-            [[entry.name, entry.molecule_id] for entry in self.data.records], columns=["name", "molecule_id"]
-        )
+        records = self.data.records
+        index = self._entry_index_cache
+        if index is None or not index.is_current(records):
+            if index is None or index.records is not records or len(records) < index.num_records:
+                index = _EntryIndex(self._entry_index_columns, self._entry_index_groups)
+            index.extend(records, self._unroll_entry)
+            self._entry_index_cache = index
+
+        return index
+
+    def _entry_index(self, subset: Optional[List[str]] = None) -> pd.DataFrame:
+        index = self._get_entry_index()
         if subset is None:
-            return ret
+            return index.frame()
         else:
-            return ret.reset_index().set_index("name").loc[subset].reset_index().set_index("index")
+            return index.frame(index.select(subset))
 
     def _check_state(self) -> None:
         if self._new_molecules or self._new_keywords or self._new_records or self._updated_state:
@@ -745,7 +836,7 @@ class Dataset(Collection):
             self._column_metadata[qname].update({"native": True, "units": self.units})
 
         self._update_cache(new_data)
-        return self.df.loc[subset, names]
+        return self._values.frame(subset, names)
 
     def _form_queries(
         self,
@@ -1073,8 +1164,8 @@ class Dataset(Collection):
         molecule_ids = list(set(indexer.values()))
         if not self._use_view(force):
             molecules: List["Molecule"] = []
-            for i in range(0, len(molecule_ids), self.client.query_limit):
-                molecules.extend(self.client.query_molecules(id=molecule_ids[i : i + self.client.query_limit]))
+            for chunk in self.client._chunked_map(lambda ids: self.client.query_molecules(id=ids), molecule_ids):
+                molecules.extend(chunk)
             # XXX: molecules = pd.DataFrame({"molecule_id": molecule_ids, "molecule": molecules}) fails
             #      test_gradient_dataset_get_molecules and I don't know why
             molecules = pd.DataFrame({"molecule_id": molecule.id, "molecule": molecule} for molecule in molecules)
@@ -1153,9 +1244,11 @@ class Dataset(Collection):
 
             # Chunk up the queries
             records: List[ResultRecord] = []
-            for i in range(0, len(molecules), self.client.query_limit):
-                query_set["molecule"] = molecules[i : i + self.client.query_limit]
-                records.extend(self.client.query_results(**query_set, status=status))
+            chunks = self.client._chunked_map(
+                lambda mols: self.client.query_results(**query_set, molecule=mols, status=status), molecules
+            )
+            for chunk in chunks:
+                records.extend(chunk)
 
             if include is None:
                 records = [{"molecule": x.molecule, "record": x} for x in records]
@@ -1204,51 +1297,93 @@ class Dataset(Collection):
         Internal compute function
         """
 
-        name, dbkeys, history = self._default_parameters(
-            compute_keys["program"],
-            compute_keys["method"],
-            compute_keys["basis"],
-            compute_keys["keywords"],
-            stoich=compute_keys.get("stoich", None),
-        )
+        return self._compute_many([(compute_keys, molecules)], tag, priority, protocols)
+
+    def _compute_many(
+        self,
+        compute_requests: List[Tuple[Dict[str, Union[str, None]], Union[List[str], pd.Series]]],
+        tag: Optional[str] = None,
+        priority: Optional[str] = None,
+        protocols: Optional[Dict[str, Any]] = None,
+    ) -> ComputeResponse:
+        """
+        Internal compute function for several (compute_keys, molecules) pairs. All add_compute batches are
+        planned up front, identical stages are merged and the batches are submitted concurrently.
+        """
 
         self._check_client()
         self._check_state()
 
-        umols = list(set(molecules))
+        # Stages shared between requests (e.g., the dftd3 part of -D3 methods) are submitted once
+        stages: Dict[Tuple, Tuple[Dict[str, Any], Dict[str, None]]] = {}
+        histories: Dict[Tuple, Dict[str, Optional[str]]] = {}
+        for compute_keys, molecules in compute_requests:
+            name, dbkeys, history = self._default_parameters(
+                compute_keys["program"],
+                compute_keys["method"],
+                compute_keys["basis"],
+                compute_keys["keywords"],
+                stoich=compute_keys.get("stoich", None),
+            )
 
-        ids: List[Optional[ObjectId]] = []
-        submitted: List[ObjectId] = []
-        existing: List[ObjectId] = []
-        for compute_set in composition_planner(**dbkeys):
+            for compute_set in composition_planner(**dbkeys):
+                stage = stages.setdefault(tuple(sorted(compute_set.items())), (compute_set, {}))
+                stage[1].update(dict.fromkeys(molecules))
 
+                qhistory = history.copy()
+                qhistory["program"] = compute_set["program"]
+                qhistory["method"] = compute_set["method"]
+                qhistory["basis"] = compute_set["basis"]
+                histories[tuple(sorted(qhistory.items()))] = qhistory
+
+        batches = []
+        for compute_set, umols in stages.values():
+            umols = list(umols)
             for i in range(0, len(umols), self.client.query_limit):
-                chunk_mols = umols[i : i + self.client.query_limit]
-                ret = self.client.add_compute(
-                    **compute_set, molecule=chunk_mols, tag=tag, priority=priority, protocols=protocols
-                )
+                batches.append((compute_set, umols[i : i + self.client.query_limit]))
 
-                ids.extend(ret.ids)
-                submitted.extend(ret.submitted)
-                existing.extend(ret.existing)
+        def submit(batch):
+            compute_set, chunk_mols = batch[0]
+            return self.client.add_compute(
+                **compute_set, molecule=chunk_mols, tag=tag, priority=priority, protocols=protocols
+            )
 
-            qhistory = history.copy()
-            qhistory["program"] = compute_set["program"]
-            qhistory["method"] = compute_set["method"]
-            qhistory["basis"] = compute_set["basis"]
+        ids: List[Optional[ObjectId]] = []
+        submitted: List[ObjectId] = []
+        existing: List[ObjectId] = []
+        for ret in self.client._chunked_map(submit, batches, chunk_size=1):
+            ids.extend(ret.ids)
+            submitted.extend(ret.submitted)
+            existing.extend(ret.existing)
+
+        for qhistory in histories.values():
             self._add_history(**qhistory)
 
         return ComputeResponse(ids=ids, submitted=submitted, existing=existing)
 
+    @staticmethod
+    def _spec_compute_keys(spec: Dict[str, Optional[str]], extra: Tuple[str, ...] = ()) -> Dict[str, Optional[str]]:
+        """
+        Validates a compute_many specification and returns its compute keys.
+        """
+
+        unknown = set(spec) - {"program", "method", "basis", "keywords", *extra}
+        if unknown:
+            raise KeyError(f"Specification keys not understood: {sorted(unknown)}.")
+        if spec.get("method", None) is None:
+            raise KeyError("Every specification requires a method.")
+
+        return {k: spec.get(k, None) for k in ("program", "method", "basis", "keywords")}
+
     @property
     def units(self):
         return self._units
 
     @units.setter
     def units(self, value):
-        for column in self.df.columns:
+        for column in self._values.columns:
             try:
-                self.df[column] *= constants.conversion_factor(self._column_metadata[column]["units"], value)
+                self._values.scale(column, constants.conversion_factor(self._column_metadata[column]["units"], value))
 
                 # Cast units to quantities so that `kcal / mol` == `kilocalorie / mole`
                 metadata_quantity = constants.Quantity(self._column_metadata[column]["units"])
@@ -1267,6 +1402,7 @@ class Dataset(Collection):
                     pass
                 else:
                     raise
+        self._invalidate_df()
         self._units = value
 
     def set_default_program(self, program: str) -> bool:
@@ -1455,18 +1591,11 @@ class Dataset(Collection):
         return ret
 
     def _subset_in_cache(self, column_name: str, subset: Set[str]) -> bool:
-        try:
-            return not self.df.loc[subset, column_name].isna().any()
-        except KeyError:
-            return False
+        return self._values.has_values(column_name, subset)
 
     def _update_cache(self, new_data: pd.DataFrame) -> None:
-        new_df = pd.DataFrame(
-            index=set(self.df.index) | set(new_data.index), columns=set(self.df.columns) | set(new_data.columns)
-        )
-        new_df.update(new_data)
-        new_df.update(self.df)
-        self.df = new_df
+        self._values.update(new_data)
+        self._invalidate_df()
 
     def _get_contributed_values(self, subset: Set[str], force: bool = False, **spec) -> pd.DataFrame:
 
@@ -1502,9 +1631,9 @@ class Dataset(Collection):
                         cv_driver = self.data.default_driver
 
                     if cv_driver == "gradient":
-                        values = [np.array(v).reshape(-1, 3) for v in data.values]
+                        values = [np.asarray(v).reshape(-1, 3) for v in data.values]
                     else:
-                        values = [np.array(v) for v in data.values]
+                        values = [np.asarray(v) for v in data.values]
 
                 new_data[column_name] = pd.Series(values, index=data.index)[subset]
                 units[column_name] = data.units
@@ -1531,7 +1660,7 @@ class Dataset(Collection):
             self._column_metadata[column_name].update(metadata)
 
         self._update_cache(new_data)
-        return self.df.loc[subset, column_names]
+        return self._values.frame(subset, column_names)
 
     def get_molecules(
         self, subset: Optional[Union[str, Set[str]]] = None, force: bool = False
@@ -1678,15 +1807,65 @@ class Dataset(Collection):
               - submitted: A list of ObjectId's that were submitted to the compute queue
               - existing: A list of ObjectId's of tasks already in the database
         """
+        spec = {"program": program, "method": method, "basis": basis, "keywords": keywords}
+        return self.compute_many([spec], subset=subset, tag=tag, priority=priority, protocols=protocols, save=save)
+
+    def compute_many(
+        self,
+        specs: List[Dict[str, Optional[str]]],
+        *,
+        subset: Optional[Set[str]] = None,
+        tag: Optional[str] = None,
+        priority: Optional[str] = None,
+        protocols: Optional[Dict[str, Any]] = None,
+        save: Optional[bool] = True,
+    ) -> ComputeResponse:
+        """Executes a grid of computational methods for all reactions in the Dataset.
+        Previously completed computations are not repeated.
+
+        All requests are planned up front, stages shared between specifications (such as the
+        dftd3 part of -D3 methods) are submitted once, and requests are sent concurrently up
+        to the client ``max_workers``.
+
+        >>> specs = [{"method": m, "basis": b} for m in ["b3lyp-d3", "pbe0-d3"] for b in ["def2-svp", "def2-tzvp"]]
+        >>> ds.compute_many(specs)
+
+        Parameters
+        ----------
+        specs : List[Dict[str, Optional[str]]]
+            The specifications to compute, each with a ``method`` and optionally ``basis``,
+            ``keywords`` (alias) and ``program`` as in ``compute``
+        subset : Set[str], optional
+            Computes only a subset of the dataset.
+        tag : Optional[str], optional
+            The queue tag to use when submitting compute requests.
+        priority : Optional[str], optional
+            The priority of the jobs low, medium, or high.
+        protocols: Optional[Dict[str, Any]], optional
+            Protocols for store more or less data per field. Current valid
+            protocols: {'wavefunction'}
+        save : bool, optional
+            If `True`, save the whole collection after calling compute
+
+        Returns
+        -------
+        ComputeResponse
+            The merged ComputeResponse of all submitted computations. This object has the following fields:
+              - ids: The ObjectId's of the task in the order of submission
+              - submitted: A list of ObjectId's that were submitted to the compute queue
+              - existing: A list of ObjectId's of tasks already in the database
+        """
+        compute_keys_list = [self._spec_compute_keys(spec) for spec in specs]
+
         self.get_entries(force=True)
-        compute_keys = {"program": program, "method": method, "basis": basis, "keywords": keywords}
 
         if subset:
             molecule_idx = set(subset)
         else:
             molecule_idx = [e.molecule_id for e in self.data.records]
 
-        ret = self._compute(compute_keys, molecule_idx, tag, priority, protocols)
+        compute_requests = [(compute_keys, molecule_idx) for compute_keys in compute_keys_list]
+        ret = self._compute_many(compute_requests, tag, priority, protocols)
 
         if save:
             self.save()
@@ -1741,11 +1920,50 @@ class Dataset(Collection):
         return (force is False) and (self._view is not None) and (self._disable_view is False)
 
     def _clear_cache(self) -> None:
-        self.df = pd.DataFrame()
+        self._value_store.clear()
+        self._invalidate_df()
         self.data.__dict__["records"] = None
         self.data.__dict__["contributed_values"] = None
 
+    @property
+    def _values(self) -> ValueStore:
+        """The columnar value store, first taking over columns added to or deleted from ``df``"""
+        if self._df is not None and list(self._df.columns) != self._df_columns:
+            columns = list(self._df.columns)
+            for column in set(self._df_columns) - set(columns):
+                self._value_store.drop(column)
+
+            added = [column for column in columns if column not in self._df_columns]
+            if added:
+                self._value_store.update(self._df[added])
+            self._df_columns = columns
+
+        return self._value_store
+
+    def _invalidate_df(self) -> None:
+        self._df = None
+        self._df_columns = []
+
     # Getters
+    @property
+    def df(self) -> pd.DataFrame:
+        """All cached values as a DataFrame.
+
+        The frame is built from the underlying columnar store on first access and reused until the
+        store changes. Columns added to or deleted from it are taken over by the store, changes to
+        existing values must be written back with ``ds[column] = values`` or ``ds.df = df``.
+        """
+        if self._df is None:
+            self._df = self._value_store.frame()
+            self._df_columns = list(self._df.columns)
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._value_store = ValueStore()
+        self._value_store.update(value)
+        self._invalidate_df()
+
     def __getitem__(self, args: str) -> pd.Series:
         """A wrapped to the underlying pd.DataFrame to access columnar data
 
@@ -1759,7 +1977,25 @@ class Dataset(Collection):
         ret : pd.Series, pd.DataFrame
             A view of the underlying dataframe data
         """
-        return self.df[args]
+        if isinstance(args, str):
+            return self._values.series(args)
+        return self._values.frame(columns=list(args))
+
+    def __setitem__(self, column: str, values: Union[pd.Series, Dict[str, Any], List[Any]]) -> None:
+        """Replaces the cached values of a column
+
+        Parameters
+        ----------
+        column : str
+            The column to set
+        values : Union[pd.Series, Dict[str, Any], List[Any]]
+            The values by entry name, or a list in the order of ``df.index``
+        """
+        if not isinstance(values, (pd.Series, dict)):
+            values = pd.Series(list(values), index=self._values.index)
+
+        self._values.replace(column, pd.Series(values))
+        self._invalidate_df()
 
 
 register_collection(Dataset)
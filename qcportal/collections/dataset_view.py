@@ -1,5 +1,4 @@
 import abc
-import distutils
 import hashlib
 import pathlib
 import shutil
@@ -11,8 +10,7 @@ from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NoReturn, Optional,
 
 import numpy as np
 import pandas as pd
-import h5py
-from qcelemental.util.serialization import deserialize, serialize
+from qcelemental.util.serialization import deserialize, msgpackext_loads, serialize
 
 from ..models import Molecule, ObjectId
 from ..util import normalize_filename
@@ -20,6 +18,8 @@ from .dataset import Dataset, MoleculeEntry
 from .reaction_dataset import ReactionDataset, ReactionEntry
 
 if TYPE_CHECKING:  # pragma: no cover
+    import h5py
+
     from .. import FractalClient
     from ..models.rest_models import CollectionSubresourceGETResponseMeta
 
@@ -156,6 +156,8 @@ class HDF5View(DatasetView):
             List of queries. Fields actually used are native, name, driver
         """
 
+        import h5py
+
         units = {}
         entries = self.get_index(subset)
         indexes = entries._h5idx
@@ -251,6 +253,9 @@ class HDF5View(DatasetView):
             return self._entries.loc[subset].reset_index()
 
     def write(self, ds: Dataset):
+        import distutils.version
+        import h5py
+
         # For data checksums
         dataset_kwargs = {"chunks": True, "fletcher32": True}
         ds.get_entries(force=True)
@@ -454,10 +459,14 @@ class HDF5View(DatasetView):
 
     @contextmanager
     def _read_file(self) -> Iterator["h5py.File"]:
+        import h5py
+
         yield h5py.File(self._path, "r")
 
     @contextmanager
     def _write_file(self) -> Iterator["h5py.File"]:
+        import h5py
+
         yield h5py.File(self._path, "w")
 
     # Methods for serializing to strings for storage in HDF5 metadata fields ("attrs")
@@ -549,7 +558,7 @@ class RemoteView(DatasetView):
 
         df = pd.read_feather(pyarrow.BufferReader(data))
         for col in msgpacked_cols:
-            df[col] = df[col].apply(lambda element: deserialize(element, "msgpack-ext"))
+            df[col] = df[col].apply(msgpackext_loads)
 
         if "index" in df.columns:
             df.set_index("index", inplace=True)  # pandas.to_feather does not support indexes,
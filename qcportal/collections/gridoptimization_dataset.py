@@ -1,7 +1,7 @@
 """
 QCPortal Database ODM
 """
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
 
 from ..models import GridOptimizationInput, ObjectId, OptimizationSpecification, ProtoModel, QCSpecification
 from ..models.gridoptimization import GOKeywords
@@ -40,15 +40,23 @@ class GridOptimizationDataset(BaseProcedureDataset):
         class Config(BaseProcedureDataset.DataModel.Config):
             pass
 
-    def _internal_compute_add(self, spec: Any, entry: Any, tag: str, priority: str) -> ObjectId:
-        service = GridOptimizationInput(
-            initial_molecule=entry.initial_molecule,
-            keywords=entry.go_keywords,
-            optimization_spec=spec.optimization_spec,
-            qc_spec=spec.qc_spec,
-        )
-
-        return self.client.add_service([service], tag=tag, priority=priority).ids[0]
+    def _internal_compute_add_many(self, spec: Any, entries: List[Any], tag: str, priority: str) -> List[ObjectId]:
+        services = [
+            GridOptimizationInput(
+                initial_molecule=entry.initial_molecule,
+                keywords=entry.go_keywords,
+                optimization_spec=spec.optimization_spec,
+                qc_spec=spec.qc_spec,
+            )
+            for entry in entries
+        ]
+
+        ret = []
+        for response in self.client._chunked_map(
+            lambda chunk: self.client.add_service(chunk, tag=tag, priority=priority), services
+        ):
+            ret.extend(response.ids)
+        return ret
 
     def add_specification(
         self,
@@ -108,17 +116,63 @@ class GridOptimizationDataset(BaseProcedureDataset):
 
         """
 
-        self._check_entry_exists(name)  # Fast skip
+        self.add_entries([name], [initial_molecule], [scans], preoptimization, [attributes], save=save)
+
+    def add_entries(
+        self,
+        names: List[str],
+        initial_molecules: List["Molecule"],
+        scans: List[List["ScanDimension"]],
+        preoptimization: Union[bool, List[bool]] = True,
+        attributes: Optional[List[Optional[Dict[str, Any]]]] = None,
+        save: bool = True,
+    ) -> None:
+        """Adds many entries at once. Each unique molecule is uploaded once and the collection is saved once.
+
+        Parameters
+        ----------
+        names : List[str]
+            The names of the entries, will be used for the index
+        initial_molecules : List[Molecule]
+            The initial molecule of each GridOptimization
+        scans : List[List[ScanDimension]]
+            The ScanDimension objects detailing the dimensions to scan over for each entry
+        preoptimization : Union[bool, List[bool]], optional
+            If True, pre-optimizes the molecules before scanning, either for all entries or per entry
+        attributes : List[Optional[Dict[str, Any]]], optional
+            Additional attributes and descriptions for each entry
+        save : bool, optional
+            If true, saves the collection after adding the entries. If this is False be careful
+            to call save after all entries are added, otherwise data pointers may be lost.
+
+        """
+
+        if isinstance(preoptimization, bool):
+            preoptimization = [preoptimization] * len(names)
+
+        self._check_columns(
+            names,
+            initial_molecules=initial_molecules,
+            scans=scans,
+            preoptimization=preoptimization,
+            attributes=attributes,
+        )
+        self._check_entries_exist(names)  # Fast skip
 
         if attributes is None:
-            attributes = {}
+            attributes = [None] * len(names)
 
         # Build new objects
-        molecule_id = self.client.add_molecules([initial_molecule])[0]
-        go_keywords = GOKeywords(scans=scans, preoptimization=preoptimization)
+        molecule_ids = self._add_molecules_by_hash(initial_molecules)
+
+        records = []
+        for name, molecule_id, scan, preopt, attrs in zip(names, molecule_ids, scans, preoptimization, attributes):
+            go_keywords = GOKeywords(scans=scan, preoptimization=preopt)
+            records.append(
+                GOEntry(name=name, initial_molecule=molecule_id, go_keywords=go_keywords, attributes=attrs or {})
+            )
 
-        record = GOEntry(name=name, initial_molecule=molecule_id, go_keywords=go_keywords, attributes=attributes)
-        self._add_entry(name, record, save)
+        self._add_entries(records, save)
 
 
 register_collection(GridOptimizationDataset)
@@ -1,8 +1,10 @@
 """
 QCPortal Database ODM
 """
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
+import json
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Union
 
+import numpy as np
 import pandas as pd
 import qcelemental as qcel
 
@@ -42,28 +44,44 @@ class OptimizationDataset(BaseProcedureDataset):
         class Config(BaseProcedureDataset.DataModel.Config):
             pass
 
-    def _internal_compute_add(self, spec: Any, entry: Any, tag: str, priority: str) -> ObjectId:
+    def _internal_compute_add_many(self, spec: Any, entries: List[Any], tag: str, priority: str) -> List[ObjectId]:
 
         # Form per-procedure keywords dictionary
         general_keywords = spec.optimization_spec.keywords
         if general_keywords is None:
             general_keywords = {}
-        keywords = {**general_keywords, **entry.additional_keywords}
 
-        procedure_parameters = {
-            "keywords": keywords,
-            "qc_spec": spec.qc_spec.dict(),
-            "protocols": spec.protocols.dict(),
-        }
+        # Entries with the same keywords share one procedure specification and are submitted together
+        groups = {}
+        for ind, entry in enumerate(entries):
+            keywords = {**general_keywords, **entry.additional_keywords}
+            key = json.dumps(keywords, sort_keys=True, default=str)
+            groups.setdefault(key, (keywords, []))[1].append(ind)
+
+        ret = [None] * len(entries)
+        for keywords, indices in groups.values():
+            procedure_parameters = {
+                "keywords": keywords,
+                "qc_spec": spec.qc_spec.dict(),
+                "protocols": spec.protocols.dict(),
+            }
+
+            def submit(chunk, procedure_parameters=procedure_parameters):
+                ids = self.client.add_procedure(
+                    "optimization",
+                    spec.optimization_spec.program,
+                    procedure_parameters,
+                    [entries[ind].initial_molecule for ind in chunk],
+                    tag=tag,
+                    priority=priority,
+                ).ids
+                return zip(chunk, ids)
+
+            for chunk in self.client._chunked_map(submit, indices):
+                for ind, oid in chunk:
+                    ret[ind] = oid
 
-        return self.client.add_procedure(
-            "optimization",
-            spec.optimization_spec.program,
-            procedure_parameters,
-            [entry.initial_molecule],
-            tag=tag,
-            priority=priority,
-        ).ids[0]
+        return ret
 
     def add_specification(
         self,
@@ -127,21 +145,55 @@ class OptimizationDataset(BaseProcedureDataset):
             to call save after all entries are added, otherwise data pointers may be lost.
         """
 
-        self._check_entry_exists(name)  # Fast skip
+        self.add_entries([name], [initial_molecule], [additional_keywords], [attributes], save=save)
+
+    def add_entries(
+        self,
+        names: List[str],
+        initial_molecules: List["Molecule"],
+        additional_keywords: Optional[List[Optional[Dict[str, Any]]]] = None,
+        attributes: Optional[List[Optional[Dict[str, Any]]]] = None,
+        save: bool = True,
+    ) -> None:
+        """Adds many entries at once. Each unique molecule is uploaded once and the collection is saved once.
+
+        Parameters
+        ----------
+        names : List[str]
+            The names of the entries, will be used for the index
+        initial_molecules : List[Molecule]
+            The starting Molecule of each Optimization
+        additional_keywords : List[Optional[Dict[str, Any]]], optional
+            Additional keywords to add to each optimization run
+        attributes : List[Optional[Dict[str, Any]]], optional
+            Additional attributes and descriptions for each entry
+        save : bool, optional
+            If true, saves the collection after adding the entries. If this is False be careful
+            to call save after all entries are added, otherwise data pointers may be lost.
+        """
+
+        self._check_columns(
+            names, initial_molecules=initial_molecules, additional_keywords=additional_keywords, attributes=attributes
+        )
+        self._check_entries_exist(names)  # Fast skip
 
         if additional_keywords is None:
-            additional_keywords = {}
+            additional_keywords = [None] * len(names)
 
         if attributes is None:
-            attributes = {}
+            attributes = [None] * len(names)
 
         # Build new objects
-        molecule_id = self.client.add_molecules([initial_molecule])[0]
-        entry = OptEntry(
-            name=name, initial_molecule=molecule_id, additional_keywords=additional_keywords, attributes=attributes
-        )
+        molecule_ids = self._add_molecules_by_hash(initial_molecules)
+        entries = []
+        for name, molecule_id, keywords, attrs in zip(names, molecule_ids, additional_keywords, attributes):
+            entries.append(
+                OptEntry(
+                    name=name, initial_molecule=molecule_id, additional_keywords=keywords or {}, attributes=attrs or {}
+                )
+            )
 
-        self._add_entry(name, entry, save)
+        self._add_entries(entries, save)
 
     def counts(
         self, entries: Optional[Union[str, List[str]]] = None, specs: Optional[Union[str, List[str]]] = None
@@ -201,5 +253,90 @@ class OptimizationDataset(BaseProcedureDataset):
         # ret = pd.DataFrame([ret[x].astype(int) for x in ret.columns]).transpose()
         return ret
 
+    def get_trajectories(
+        self,
+        specification: str,
+        fields: Sequence[str] = ("energy", "gradient", "geometry"),
+        entries: Optional[Union[str, List[str]]] = None,
+    ) -> pd.DataFrame:
+        """Extracts the trajectories of all optimizations of a specification into a single table.
+
+        Energies are taken from the optimization records. Gradient results are fetched in chunked,
+        projected queries and the molecules of every step in chunked molecule queries, so no
+        per-record requests are made.
+
+        Parameters
+        ----------
+        specification : str
+            The specification to pull the trajectories of
+        fields : Sequence[str], optional
+            The quantities of each step, any of {"energy", "gradient", "geometry"}
+        entries : Optional[Union[str, List[str]]], optional
+            The entries to pull, all entries with a completed optimization by default
+
+        Returns
+        -------
+        DataFrame
+            A DataFrame indexed by (entry, step) with a column per field. Energies are floats,
+            gradients and geometries are (natoms, 3) arrays in atomic units.
+        """
+
+        fields = list(fields)
+        unknown = set(fields) - {"energy", "gradient", "geometry"}
+        if unknown:
+            raise KeyError(f"Trajectory fields not understood: {sorted(unknown)}.")
+
+        if isinstance(entries, str):
+            entries = [entries]
+
+        self.query(specification)
+        data = self.df[self.get_specification(specification).name]
+        if entries:
+            data = data[entries]
+
+        optimizations = {
+            name: opt for name, opt in data.items() if getattr(opt, "status", None) == "COMPLETE" and opt.trajectory
+        }
+
+        # Only pull the parts of each result which are needed, energies are held by the optimizations
+        include = {"id"}
+        if "gradient" in fields:
+            include.add("return_result")
+        if "geometry" in fields:
+            include.add("molecule")
+
+        results = {}
+        if len(include) > 1:
+            result_ids = list(dict.fromkeys(x for opt in optimizations.values() for x in opt.trajectory))
+            for chunk in self.client._chunked_map(
+                lambda ids: self.client.query_results(id=ids, include=sorted(include)), result_ids
+            ):
+                results.update((x["id"], x) for x in chunk)
+
+        geometries = {}
+        if "geometry" in fields:
+            molecule_ids = list(dict.fromkeys(x["molecule"] for x in results.values()))
+            for chunk in self.client._chunked_map(lambda ids: self.client.query_molecules(id=ids), molecule_ids):
+                geometries.update((x.id, x.geometry) for x in chunk)
+
+        rows = []
+        for name, opt in optimizations.items():
+            energies = opt.energies or []
+            for step, result_id in enumerate(opt.trajectory):
+                result = results.get(result_id, None)
+                if result is None and len(include) > 1:
+                    continue
+
+                row = {"entry": name, "step": step}
+                if "energy" in fields:
+                    row["energy"] = energies[step] if step < len(energies) else None
+                if "gradient" in fields:
+                    row["gradient"] = np.asarray(result["return_result"], dtype=float).reshape(-1, 3)
+                if "geometry" in fields:
+                    row["geometry"] = geometries[result["molecule"]]
+                rows.append(row)
+
+        return pd.DataFrame(rows, columns=["entry", "step", *fields]).set_index(["entry", "step"])
+
 
 register_collection(OptimizationDataset)
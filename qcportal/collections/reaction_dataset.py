@@ -86,21 +86,16 @@ class ReactionDataset(Dataset):
             "stoichiometry",
         )
 
-    def _entry_index(self, subset: Optional[List[str]] = None) -> None:
-        if self.data.records is None:
-            self._get_data_records_from_db()
-        # Unroll the index
-        tmp_index = []
-        for rxn in self.data.records:
-            name = rxn.name
-            for stoich_name in list(rxn.stoichiometry):
-                for mol_hash, coef in rxn.stoichiometry[stoich_name].items():
-                    tmp_index.append([name, stoich_name, mol_hash, coef])
-        ret = pd.DataFrame(tmp_index, columns=["name", "stoichiometry", "molecule", "coefficient"])
-        if subset is None:
-            return ret
-        else:
-            return ret.reset_index().set_index("name").loc[subset].reset_index().set_index("index")
+    _entry_index_columns: Tuple[str, ...] = ("name", "stoichiometry", "molecule", "coefficient")
+    _entry_index_groups: Tuple[str, ...] = ("stoichiometry",)
+
+    @staticmethod
+    def _unroll_entry(rxn: ReactionEntry) -> List[Tuple[Any, ...]]:
+        ret = []
+        for stoich_name, stoich in rxn.stoichiometry.items():
+            for mol_hash, coef in stoich.items():
+                ret.append((rxn.name, stoich_name, mol_hash, coef))
+        return ret
 
     def _molecule_indexer(
         self,
@@ -133,11 +128,15 @@ class ReactionDataset(Dataset):
         if isinstance(stoich, str):
             stoich = [stoich]
 
-        index = self.get_entries(subset=subset, force=force)
-        matched_rows = index[np.in1d(index["stoichiometry"], stoich)]
+        if self._use_view(force):
+            index = self.get_entries(subset=subset, force=force)
+            matched_rows = index[np.in1d(index["stoichiometry"], stoich)]
 
-        if subset:
-            matched_rows = matched_rows[np.in1d(matched_rows["name"], subset)]
+            if subset:
+                matched_rows = matched_rows[np.in1d(matched_rows["name"], subset)]
+        else:
+            index = self._get_entry_index()
+            matched_rows = index.frame(index.select(subset, stoichiometry=stoich))
 
         names = ("name", "stoichiometry", "idx")
         if coefficients:
@@ -181,7 +180,7 @@ class ReactionDataset(Dataset):
         self._new_records: List[ReactionEntry] = []
         self._new_molecules = {}
 
-        self._entry_index()
+        self._get_entry_index()
 
     def get_values(
         self,
@@ -343,7 +342,7 @@ class ReactionDataset(Dataset):
             self._column_metadata[qname].update({"native": True, "units": units[qname]})
 
         self._update_cache(new_data)
-        return self.df.loc[subset, names]
+        return self._values.frame(subset, names)
 
     def visualize(
         self,
@@ -548,30 +547,68 @@ class ReactionDataset(Dataset):
               - submitted: A list of ObjectId's that were submitted to the compute queue
               - existing: A list of ObjectId's of tasks already in the database
 
+        """
+        spec = {"program": program, "method": method, "basis": basis, "keywords": keywords, "stoich": stoich}
+        return self.compute_many([spec], ignore_ds_type=ignore_ds_type, tag=tag, priority=priority)
+
+    def compute_many(
+        self,
+        specs: List[Dict[str, Optional[str]]],
+        *,
+        ignore_ds_type: bool = False,
+        tag: Optional[str] = None,
+        priority: Optional[str] = None,
+    ) -> "ComputeResponse":
+        """Executes a grid of computational methods for all reactions in the Dataset.
+        Previously completed computations are not repeated.
+
+        All requests are planned up front, stages shared between specifications are submitted
+        once, and requests are sent concurrently up to the client ``max_workers``.
+
+        Parameters
+        ----------
+        specs : List[Dict[str, Optional[str]]]
+            The specifications to compute, each with a ``method`` and optionally ``basis``,
+            ``keywords`` (alias), ``program`` and ``stoich`` as in ``compute``
+        ignore_ds_type : bool, optional
+            Optionally only compute the "default" geometry
+        tag : Optional[str], optional
+            The queue tag to use when submitting compute requests.
+        priority : Optional[str], optional
+            The priority of the jobs low, medium, or high.
+
+        Returns
+        -------
+        ComputeResponse
+            The merged ComputeResponse of all submitted computations. This object has the following fields:
+              - ids: The ObjectId's of the task in the order of submission
+              - submitted: A list of ObjectId's that were submitted to the compute queue
+              - existing: A list of ObjectId's of tasks already in the database
+
         """
         self._check_client()
         self._check_state()
 
         entry_index = self.get_entries(force=True)
 
-        self._validate_stoich(stoich, subset=None, force=True)
-        compute_keys = {"program": program, "method": method, "basis": basis, "keywords": keywords, "stoich": stoich}
+        compute_requests = []
+        for spec in specs:
+            stoich = spec.get("stoich", None) or "default"
+            compute_keys = self._spec_compute_keys(spec, extra=("stoich",))
+            compute_keys["stoich"] = stoich
 
-        # Figure out molecules that we need
-        if (not ignore_ds_type) and (self.data.ds_type.lower() == "ie"):
+            self._validate_stoich(stoich, subset=None, force=True)
 
-            monomer_stoich = "".join([x for x in stoich if not x.isdigit()]) + "1"
-            tmp_monomer = entry_index[entry_index["stoichiometry"] == monomer_stoich].copy()
+            # Figure out molecules that we need
+            if (not ignore_ds_type) and (self.data.ds_type.lower() == "ie"):
+                monomer_stoich = "".join([x for x in stoich if not x.isdigit()]) + "1"
+                tmp_monomer = entry_index[entry_index["stoichiometry"] == monomer_stoich]
+                compute_requests.append((compute_keys, tmp_monomer["molecule"]))
 
-            ret1 = self._compute(compute_keys, tmp_monomer["molecule"], tag, priority)
+            tmp_complex = entry_index[entry_index["stoichiometry"] == stoich]
+            compute_requests.append((compute_keys, tmp_complex["molecule"]))
 
-            tmp_complex = entry_index[entry_index["stoichiometry"] == stoich].copy()
-            ret2 = self._compute(compute_keys, tmp_complex["molecule"], tag, priority)
-
-            ret = ret1.merge(ret2)
-        else:
-            tmp_complex = entry_index[entry_index["stoichiometry"] == stoich].copy()
-            ret = self._compute(compute_keys, tmp_complex["molecule"], tag, priority)
+        ret = self._compute_many(compute_requests, tag, priority)
 
         # Update the record that this was computed
         self.save()
@@ -594,10 +631,7 @@ class ReactionDataset(Dataset):
 
         """
 
-        found = []
-        for num, x in enumerate(self.data.records):
-            if x.name == name:
-                found.append(num)
+        found = self._get_entry_index().record_positions.get(name, [])
 
         if len(found) == 0:
             raise KeyError("Dataset:get_rxn: Reaction name '{}' not found.".format(name))
@@ -42,16 +42,24 @@ class TorsionDriveDataset(BaseProcedureDataset):
         class Config(BaseProcedureDataset.DataModel.Config):
             pass
 
-    def _internal_compute_add(self, spec: Any, entry: Any, tag: str, priority: str) -> ObjectId:
+    def _internal_compute_add_many(self, spec: Any, entries: List[Any], tag: str, priority: str) -> List[ObjectId]:
+
+        services = [
+            TorsionDriveInput(
+                initial_molecule=entry.initial_molecules,
+                keywords=entry.td_keywords,
+                optimization_spec=spec.optimization_spec,
+                qc_spec=spec.qc_spec,
+            )
+            for entry in entries
+        ]
 
-        service = TorsionDriveInput(
-            initial_molecule=entry.initial_molecules,
-            keywords=entry.td_keywords,
-            optimization_spec=spec.optimization_spec,
-            qc_spec=spec.qc_spec,
-        )
-
-        return self.client.add_service([service], tag=tag, priority=priority).ids[0]
+        ret = []
+        for response in self.client._chunked_map(
+            lambda chunk: self.client.add_service(chunk, tag=tag, priority=priority), services
+        ):
+            ret.extend(response.ids)
+        return ret
 
     def add_specification(
         self,
@@ -122,28 +130,102 @@ class TorsionDriveDataset(BaseProcedureDataset):
             to call save after all entries are added, otherwise data pointers may be lost.
         """
 
-        self._check_entry_exists(name)  # Fast skip
-
-        if attributes is None:
-            attributes = {}
+        self.add_entries(
+            [name],
+            [initial_molecules],
+            [dihedrals],
+            [grid_spacing],
+            dihedral_ranges=[dihedral_ranges],
+            energy_decrease_thresh=[energy_decrease_thresh],
+            energy_upper_limit=[energy_upper_limit],
+            additional_keywords=[additional_keywords],
+            attributes=[attributes],
+            save=save,
+        )
 
-        if additional_keywords is None:
-            additional_keywords = {}
+    def add_entries(
+        self,
+        names: List[str],
+        initial_molecules: List[List["Molecule"]],
+        dihedrals: List[List[Tuple[int, int, int, int]]],
+        grid_spacing: List[List[int]],
+        dihedral_ranges: Optional[List[Optional[List[Tuple[int, int]]]]] = None,
+        energy_decrease_thresh: Optional[List[Optional[float]]] = None,
+        energy_upper_limit: Optional[List[Optional[float]]] = None,
+        additional_keywords: Optional[List[Optional[Dict[str, Any]]]] = None,
+        attributes: Optional[List[Optional[Dict[str, Any]]]] = None,
+        save: bool = True,
+    ) -> None:
+        """Adds many entries at once. Each unique molecule is uploaded once and the collection is saved once.
 
-        # Build new objects
-        molecule_ids = self.client.add_molecules(initial_molecules)
-        td_keywords = TDKeywords(
-            dihedrals=dihedrals,
-            grid_spacing=grid_spacing,
-            dihedral_ranges=dihedral_ranges,
-            energy_decrease_thresh=energy_decrease_thresh,
-            energy_upper_limit=energy_upper_limit,
-            additional_keywords=additional_keywords,
-        )
+        All arguments hold one item per entry name, see ``add_entry`` for the meaning of each item.
 
-        entry = TDEntry(name=name, initial_molecules=molecule_ids, td_keywords=td_keywords, attributes=attributes)
+        Parameters
+        ----------
+        names : List[str]
+            The names of the entries, will be used for the index
+        initial_molecules : List[List[Molecule]]
+            The starting Molecules of each TorsionDrive
+        dihedrals : List[List[Tuple[int, int, int, int]]]
+            The dihedrals to scan over for each entry
+        grid_spacing : List[List[int]]
+            The grid spacing of each dihedral for each entry
+        dihedral_ranges: Optional[List[Optional[List[Tuple[int, int]]]]]
+            The range limit of each dihedral to scan for each entry
+        energy_decrease_thresh: Optional[List[Optional[float]]]
+            The threshold of energy decrease to trigger activating grid points for each entry
+        energy_upper_limit: Optional[List[Optional[float]]]
+            The upper limit of relative energy to trigger activating grid points for each entry
+        additional_keywords : Optional[List[Optional[Dict[str, Any]]]], optional
+            Additional keywords to add to each torsiondrive's optimization runs
+        attributes : Optional[List[Optional[Dict[str, Any]]]], optional
+            Additional attributes and descriptions for each entry
+        save : bool, optional
+            If true, saves the collection after adding the entries. If this is False be careful
+            to call save after all entries are added, otherwise data pointers may be lost.
+        """
 
-        self._add_entry(name, entry, save)
+        columns = {
+            "initial_molecules": initial_molecules,
+            "dihedrals": dihedrals,
+            "grid_spacing": grid_spacing,
+            "dihedral_ranges": dihedral_ranges,
+            "energy_decrease_thresh": energy_decrease_thresh,
+            "energy_upper_limit": energy_upper_limit,
+            "additional_keywords": additional_keywords,
+            "attributes": attributes,
+        }
+        self._check_columns(names, **columns)
+        self._check_entries_exist(names)  # Fast skip
+
+        columns = {k: ([None] * len(names) if v is None else v) for k, v in columns.items()}
+
+        # Upload all molecules at once, then split them back up per entry
+        flat_ids = self._add_molecules_by_hash([mol for mols in initial_molecules for mol in mols])
+
+        entries = []
+        start = 0
+        for ind, name in enumerate(names):
+            stop = start + len(initial_molecules[ind])
+            td_keywords = TDKeywords(
+                dihedrals=dihedrals[ind],
+                grid_spacing=grid_spacing[ind],
+                dihedral_ranges=columns["dihedral_ranges"][ind],
+                energy_decrease_thresh=columns["energy_decrease_thresh"][ind],
+                energy_upper_limit=columns["energy_upper_limit"][ind],
+                additional_keywords=columns["additional_keywords"][ind] or {},
+            )
+
+            entry = TDEntry(
+                name=name,
+                initial_molecules=flat_ids[start:stop],
+                td_keywords=td_keywords,
+                attributes=columns["attributes"][ind] or {},
+            )
+            entries.append(entry)
+            start = stop
+
+        self._add_entries(entries, save)
 
     def counts(
         self,
@@ -210,6 +292,8 @@ class TorsionDriveDataset(BaseProcedureDataset):
                 data = data[entries]
 
             if count_gradients:
+                # Fetch the histories of all torsiondrives at once rather than one record at a time
+                self._prefetch_history([td for td in data if getattr(td, "status", None) == "COMPLETE"])
                 cnts = data.apply(lambda td: count_gradient_evals(td))
             else:
                 cnts = data.apply(lambda td: count_optimizations(td))
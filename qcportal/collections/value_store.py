@@ -0,0 +1,333 @@
+"""
+A columnar, typed store for the cached values of a Dataset
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Only floats go to the float64 columns, integers and booleans keep their type in object columns
+_SCALAR_TYPES = (float, np.floating)
+
+
+def _is_null(value: Any) -> bool:
+    return value is None or (np.isscalar(value) and pd.isna(value))
+
+
+def _classify(values: List[Any]) -> str:
+    """Returns the narrowest column kind able to hold all values, which are not null"""
+    if all(isinstance(v, _SCALAR_TYPES) for v in values):
+        return "scalar"
+
+    if all(isinstance(v, (np.ndarray, list, tuple)) for v in values):
+        try:
+            if all(np.asarray(v).dtype.kind == "f" for v in values):
+                return "ragged"
+        except ValueError:  # Inhomogeneous nested lists
+            pass
+
+    return "object"
+
+
+class _ScalarColumn:
+    """Float64 values with a validity mask"""
+
+    kind = "scalar"
+
+    def __init__(self, capacity: int) -> None:
+        self.values = np.full(capacity, np.nan)
+        self.valid = np.zeros(capacity, dtype=bool)
+
+    def resize(self, capacity: int) -> None:
+        self.values = np.concatenate([self.values, np.full(capacity - len(self.values), np.nan)])
+        self.valid = np.concatenate([self.valid, np.zeros(capacity - len(self.valid), dtype=bool)])
+
+    def set(self, positions: np.ndarray, values: List[Any]) -> None:
+        self.values[positions] = np.asarray(values, dtype=float)
+        self.valid[positions] = True
+
+    def get(self, positions: np.ndarray) -> np.ndarray:
+        return np.where(self.valid[positions], self.values[positions], np.nan)
+
+    def get_objects(self, positions: np.ndarray) -> List[Any]:
+        return [float(v) for v in self.values[positions]]
+
+    def scale(self, factor: float) -> None:
+        self.values = self.values * factor
+
+
+class _RaggedColumn:
+    """Numeric arrays of varying shape in one flat float64 buffer, addressed by per-row offsets"""
+
+    kind = "ragged"
+
+    def __init__(self, capacity: int) -> None:
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.starts = np.zeros(capacity, dtype=np.int64)
+        self.sizes = np.zeros(capacity, dtype=np.int64)
+        self.shapes: List[Optional[tuple]] = [None] * capacity
+
+        self.flat = np.empty(0)
+        self.used = 0
+
+    def resize(self, capacity: int) -> None:
+        extra = capacity - len(self.valid)
+        self.valid = np.concatenate([self.valid, np.zeros(extra, dtype=bool)])
+        self.starts = np.concatenate([self.starts, np.zeros(extra, dtype=np.int64)])
+        self.sizes = np.concatenate([self.sizes, np.zeros(extra, dtype=np.int64)])
+        self.shapes.extend([None] * extra)
+
+    def set(self, positions: np.ndarray, values: List[Any]) -> None:
+        arrays = [np.asarray(v, dtype=float) for v in values]
+        total = sum(arr.size for arr in arrays)
+
+        # Overwritten segments become garbage, compact once they dominate the buffer
+        live = int(self.sizes[self.valid].sum())
+        if self.used - live > max(live, 1024):
+            self._compact()
+
+        if self.used + total > len(self.flat):
+            self.flat = np.concatenate([self.flat[: self.used], np.empty(max(self.used + total, 2 * len(self.flat)))])
+
+        for pos, arr in zip(positions, arrays):
+            self.flat[self.used : self.used + arr.size] = arr.ravel()
+            self.starts[pos] = self.used
+            self.sizes[pos] = arr.size
+            self.shapes[pos] = arr.shape
+            self.valid[pos] = True
+            self.used += arr.size
+
+    def _compact(self) -> None:
+        positions = np.flatnonzero(self.valid)
+        segments = [self.flat[self.starts[p] : self.starts[p] + self.sizes[p]] for p in positions]
+        self.flat = np.concatenate(segments) if segments else np.empty(0)
+        self.starts[positions] = np.cumsum(self.sizes[positions]) - self.sizes[positions]
+        self.used = len(self.flat)
+
+    def get_objects(self, positions: np.ndarray) -> List[Any]:
+        ret = []
+        for pos in positions:
+            if self.valid[pos]:
+                start = self.starts[pos]
+                ret.append(self.flat[start : start + self.sizes[pos]].reshape(self.shapes[pos]))
+            else:
+                ret.append(np.nan)
+        return ret
+
+    def get(self, positions: np.ndarray) -> np.ndarray:
+        ret = np.empty(len(positions), dtype=object)
+        ret[:] = self.get_objects(positions)
+        return ret
+
+    def scale(self, factor: float) -> None:
+        # A new buffer so that arrays handed out earlier are not modified
+        self.flat = self.flat[: self.used] * factor
+
+
+class _ObjectColumn:
+    """Arbitrary Python objects, the fallback for values which are not numeric"""
+
+    kind = "object"
+
+    def __init__(self, capacity: int) -> None:
+        self.values = np.full(capacity, np.nan, dtype=object)
+        self.valid = np.zeros(capacity, dtype=bool)
+
+    @classmethod
+    def from_column(cls, column: Any) -> "_ObjectColumn":
+        ret = cls(len(column.valid))
+        positions = np.flatnonzero(column.valid)
+        ret.set(positions, column.get_objects(positions))
+        return ret
+
+    def resize(self, capacity: int) -> None:
+        self.values = np.concatenate([self.values, np.full(capacity - len(self.values), np.nan, dtype=object)])
+        self.valid = np.concatenate([self.valid, np.zeros(capacity - len(self.valid), dtype=bool)])
+
+    def set(self, positions: np.ndarray, values: List[Any]) -> None:
+        tmp = np.empty(len(values), dtype=object)
+        tmp[:] = values
+        self.values[positions] = tmp
+        self.valid[positions] = True
+
+    def get(self, positions: np.ndarray) -> np.ndarray:
+        return self.values[positions]
+
+    def get_objects(self, positions: np.ndarray) -> List[Any]:
+        return list(self.values[positions])
+
+    def scale(self, factor: float) -> None:
+        positions = np.flatnonzero(self.valid)
+        self.set(positions, [v * factor for v in self.values[positions]])
+
+
+_COLUMN_KINDS = {"scalar": _ScalarColumn, "ragged": _RaggedColumn, "object": _ObjectColumn}
+
+
+class ValueStore:
+    """
+    The cached values of a Dataset, held column by column.
+
+    Float columns are float64 arrays, columns of float arrays such as gradients are a flat float64
+    buffer addressed by per-row offsets and shapes, and anything else, integers and booleans included,
+    falls back to an object array so that values keep their type. Every
+    column carries a validity mask, so adding rows or columns only touches the new data. DataFrames are
+    only built on request by ``frame``.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._capacity = 0
+        self._columns: Dict[str, Any] = {}
+
+    def __repr__(self) -> str:
+        return f"ValueStore(rows={len(self._names)}, columns={list(self._columns)})"
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def index(self) -> List[str]:
+        return list(self._names)
+
+    def _add_rows(self, names: Iterable[str]) -> np.ndarray:
+        positions = []
+        for name in names:
+            pos = self._index.get(name)
+            if pos is None:
+                pos = self._index[name] = len(self._names)
+                self._names.append(name)
+            positions.append(pos)
+
+        if len(self._names) > self._capacity:
+            self._capacity = max(len(self._names), 2 * self._capacity)
+            for column in self._columns.values():
+                column.resize(self._capacity)
+
+        return np.asarray(positions, dtype=np.int64)
+
+    def _positions(self, names: Optional[Iterable[str]]) -> np.ndarray:
+        if names is None:
+            return np.arange(len(self._names), dtype=np.int64)
+        return np.asarray([self._index[name] for name in names], dtype=np.int64)
+
+    def _write(self, column: str, positions: np.ndarray, values: List[Any], kind: Optional[str] = None) -> None:
+        if kind is None:
+            kind = _classify(values)
+        col = self._columns.get(column)
+        if col is None or (col.kind != kind and not col.valid.any()):
+            col = _COLUMN_KINDS[kind](self._capacity)
+        elif col.kind != kind and col.kind != "object":
+            col = _ObjectColumn.from_column(col)
+
+        col.set(positions, values)
+        self._columns[column] = col
+
+    def update(self, data: pd.DataFrame) -> None:
+        """Adds the rows and columns of a DataFrame, cells which are not null overwrite held values
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            The new data, indexed by entry name
+        """
+        positions = self._add_rows(data.index)
+
+        for column in data.columns:
+            values = data[column].values
+            if values.dtype.kind == "f":
+                mask = ~pd.isna(values)
+                if column not in self._columns or self._columns[column].kind == "scalar":
+                    self._write(column, positions[mask], values[mask], kind="scalar")
+                    continue
+            else:
+                mask = np.array([not _is_null(v) for v in values], dtype=bool)
+
+            self._write(column, positions[mask], list(values[mask]))
+
+    def has_values(self, column: str, names: Iterable[str]) -> bool:
+        """Returns True if the column holds a value for every given row"""
+        col = self._columns.get(column)
+        if col is None:
+            return False
+        try:
+            return bool(col.valid[self._positions(names)].all())
+        except KeyError:
+            return False
+
+    def series(self, column: str, names: Optional[Iterable[str]] = None) -> pd.Series:
+        """Returns a column as a Series, missing values are NaN
+
+        Parameters
+        ----------
+        column : str
+            The column to return
+        names : Optional[Iterable[str]], optional
+            The rows to return, all rows in insertion order by default
+        """
+        if names is not None:
+            names = list(names)
+        positions = self._positions(names)
+        index = pd.Index(self._names if names is None else names)
+        return pd.Series(self._columns[column].get(positions), index=index, name=column).infer_objects()
+
+    def frame(self, names: Optional[Iterable[str]] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Builds a DataFrame of the held values
+
+        Parameters
+        ----------
+        names : Optional[Iterable[str]], optional
+            The rows to return, all rows in insertion order by default
+        columns : Optional[List[str]], optional
+            The columns to return, all columns by default
+
+        Returns
+        -------
+        pd.DataFrame
+            The requested values, missing values are NaN
+        """
+        if names is not None:
+            names = list(names)
+        if columns is None:
+            columns = list(self._columns)
+
+        positions = self._positions(names)
+        index = pd.Index(self._names if names is None else names)
+        data = {column: self._columns[column].get(positions) for column in columns}
+        return pd.DataFrame(data, index=index, columns=columns).infer_objects()
+
+    def drop(self, column: str) -> None:
+        """Removes a column if present"""
+        self._columns.pop(column, None)
+
+    def replace(self, column: str, values: pd.Series) -> None:
+        """Replaces all values of a column, keeping its position among the columns
+
+        Parameters
+        ----------
+        column : str
+            The column to replace
+        values : pd.Series
+            The new values, indexed by entry name
+        """
+        if column in self._columns:
+            # An empty column is swapped for one of the right kind on the first write
+            self._columns[column] = _ObjectColumn(self._capacity)
+        self.update(pd.DataFrame({column: values}, index=values.index))
+
+    def scale(self, column: str, factor: float) -> None:
+        """Multiplies all values of a column by a factor"""
+        self._columns[column].scale(factor)
+
+    def clear(self) -> None:
+        """Removes all rows and columns"""
+        self.__init__()
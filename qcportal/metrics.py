@@ -0,0 +1,133 @@
+"""
+Per-endpoint transport metrics for the FractalClient
+"""
+
+import bisect
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    import pandas as pd
+
+# Upper bounds in seconds of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+
+class ClientMetrics:
+    """
+    Aggregates request metrics per (endpoint, method) pair.
+
+    For every request the wall latency, the body bytes sent and received, the time spent decoding the
+    response body, the time spent validating it into pydantic models, and whether it failed are
+    recorded. Hooks added with ``add_hook`` receive each request as a dictionary, which allows
+    exporting to external monitoring.
+    """
+
+    _fields = ("requests", "errors", "bytes_sent", "bytes_received", "latency", "decode_time", "validation_time")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._data: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._hooks: List[Callable[[Dict[str, Any]], None]] = []
+
+    def __repr__(self) -> str:
+        return f"ClientMetrics(endpoints={len(self._data)})"
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """Adds a function which is called with the metrics of every request
+
+        Parameters
+        ----------
+        hook : Callable[[Dict[str, Any]], None]
+            Called with a dictionary containing the keys endpoint, method, latency, bytes_sent,
+            bytes_received, decode_time, validation_time and error.
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """Removes a previously added hook"""
+        self._hooks.remove(hook)
+
+    def record(
+        self,
+        endpoint: str,
+        method: str,
+        *,
+        latency: float,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        decode_time: float = 0.0,
+        validation_time: float = 0.0,
+        error: bool = False,
+    ) -> None:
+        """Records a single request"""
+        with self._lock:
+            entry = self._data.get((endpoint, method))
+            if entry is None:
+                entry = {k: 0 for k in self._fields}
+                entry["latency_histogram"] = [0] * len(LATENCY_BUCKETS)
+                self._data[(endpoint, method)] = entry
+
+            entry["requests"] += 1
+            entry["errors"] += int(error)
+            entry["bytes_sent"] += bytes_sent
+            entry["bytes_received"] += bytes_received
+            entry["latency"] += latency
+            entry["decode_time"] += decode_time
+            entry["validation_time"] += validation_time
+            entry["latency_histogram"][bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        if self._hooks:
+            event = {
+                "endpoint": endpoint,
+                "method": method,
+                "latency": latency,
+                "bytes_sent": bytes_sent,
+                "bytes_received": bytes_received,
+                "decode_time": decode_time,
+                "validation_time": validation_time,
+                "error": error,
+            }
+            for hook in self._hooks:
+                hook(event)
+
+    def snapshot(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """Returns a copy of the current metrics
+
+        Returns
+        -------
+        Dict[Tuple[str, str], Dict[str, Any]]
+            The metrics of each (endpoint, method) pair. Times are total seconds and
+            ``latency_histogram`` maps each bucket upper bound to a request count.
+        """
+        with self._lock:
+            ret = {}
+            for key, entry in self._data.items():
+                ret[key] = {k: entry[k] for k in self._fields}
+                ret[key]["latency_histogram"] = dict(zip(LATENCY_BUCKETS, entry["latency_histogram"]))
+            return ret
+
+    def to_dataframe(self) -> "pd.DataFrame":
+        """Returns the current metrics as a DataFrame indexed by (endpoint, method)
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per endpoint with the totals of each metric and the mean latency.
+        """
+        import pandas as pd
+
+        rows = []
+        for (endpoint, method), entry in self.snapshot().items():
+            row = {"endpoint": endpoint, "method": method}
+            row.update({k: entry[k] for k in self._fields})
+            row["mean_latency"] = entry["latency"] / entry["requests"]
+            rows.append(row)
+
+        df = pd.DataFrame(rows, columns=["endpoint", "method", *self._fields, "mean_latency"])
+        return df.set_index(["endpoint", "method"])
+
+    def reset(self) -> None:
+        """Clears all recorded metrics"""
+        with self._lock:
+            self._data.clear()
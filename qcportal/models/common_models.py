@@ -1,15 +1,17 @@
 """
 Common models for QCPortal/Fractal
 """
+import codecs
 import json
 
 # For compression
 import lzma
 import bz2
 import gzip
+import zlib
 
 from enum import Enum
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Iterator, Optional, Union
 
 from pydantic import Field, validator
 from qcelemental.models import AutodocBaseSettings, Molecule, ProtoModel, Provenance
@@ -200,6 +202,73 @@ class KVStore(ProtoModel):
             # Shouldn't ever happen, unless we change CompressionEnum but not the rest of this function
             raise TypeError("Unknown compression type??")
 
+    def _iter_bytes(self, chunk_size: int) -> Iterator[bytes]:
+        """
+        Decompresses the data incrementally, yielding at most chunk_size bytes at a time
+        """
+        if self.compression is CompressionEnum.none:
+            for i in range(0, len(self.data), chunk_size):
+                yield self.data[i : i + chunk_size]
+
+        elif self.compression is CompressionEnum.gzip:
+            decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+            remaining = self.data
+            while remaining and not decompressor.eof:
+                out = decompressor.decompress(remaining, chunk_size)
+                remaining = decompressor.unconsumed_tail
+                if out:
+                    yield out
+            out = decompressor.flush()
+            if out:
+                yield out
+
+        elif self.compression in (CompressionEnum.bzip2, CompressionEnum.lzma):
+            if self.compression is CompressionEnum.bzip2:
+                decompressor = bz2.BZ2Decompressor()
+            else:
+                decompressor = lzma.LZMADecompressor()
+
+            # The decompressor buffers the input itself, later calls continue from there
+            out = decompressor.decompress(self.data, chunk_size)
+            while True:
+                if out:
+                    yield out
+                if decompressor.eof or decompressor.needs_input:
+                    break
+                out = decompressor.decompress(b"", chunk_size)
+
+        else:
+            # Shouldn't ever happen, unless we change CompressionEnum but not the rest of this function
+            raise TypeError("Unknown compression type??")
+
+    def iter_chunks(self, chunk_size: int = 2 ** 20) -> Iterator[str]:
+        """
+        Decompresses the output incrementally, yielding pieces of at most ``chunk_size`` characters
+        so that the full string is never held in memory
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        for data in self._iter_bytes(chunk_size):
+            text = decoder.decode(data)
+            if text:
+                yield text
+
+        text = decoder.decode(b"", final=True)
+        if text:
+            yield text
+
+    def iter_lines(self, chunk_size: int = 2 ** 20) -> Iterator[str]:
+        """
+        Decompresses the output incrementally, yielding one line at a time without the line break
+        """
+        pending = ""
+        for text in self.iter_chunks(chunk_size):
+            lines = (pending + text).split("\n")
+            pending = lines.pop()
+            yield from lines
+
+        if pending:
+            yield pending
+
     def get_json(self):
         """
         Returns a dict if the data stored is a JSON string
@@ -142,6 +142,7 @@ class GridOptimizationRecord(RecordBase):
 
     # Classdata
     _hash_indices = {"initial_molecule", "keywords", "optimization_meta", "qc_spec"}
+    _history_key = "optimization_history"
 
     # Version data
     version: int = Field(1, description="The version number of the Record.")
@@ -316,13 +317,41 @@ class GridOptimizationRecord(RecordBase):
         """
 
         if "optimization_history" not in self.cache:
-            procs = self.client.query_procedures(id=list(self.grid_optimizations.values()))
-            proc_map = {x.id: x for x in procs}
+            proc_map = {}
+            for chunk in self.client._chunked_map(
+                lambda ids: self.client.query_procedures(id=ids), self._history_ids()
+            ):
+                proc_map.update((x.id, x) for x in chunk)
 
-            self.cache["optimization_history"] = {k: proc_map[v] for k, v in self.grid_optimizations.items()}
+            self._set_history(proc_map)
 
         return self._organize_return(self.cache["optimization_history"], key)
 
+    def _history_ids(self) -> List[ObjectId]:
+        """Returns the ids of all optimizations in the history"""
+        return list(dict.fromkeys(self.grid_optimizations.values()))
+
+    def _set_history(self, procedures: Dict[str, Any]) -> None:
+        """Fills the history cache from a {id: procedure} map, which may be shared between records"""
+        self.cache["optimization_history"] = {k: procedures[v] for k, v in self.grid_optimizations.items()}
+
+    def _query_final(self, query_type: str) -> Dict[str, Any]:
+        """Runs an optimization custom query over all grid optimizations in chunks, keyed by grid point"""
+
+        opt_ids = list(dict.fromkeys(self.grid_optimizations.values()))
+
+        results = {}
+        for chunk in self.client._chunked_map(
+            lambda ids: self.client.custom_query("optimization", query_type, {"optimization_ids": ids}), opt_ids
+        ):
+            results.update(chunk)
+
+        for obj in results.values():
+            if isinstance(obj, RecordBase):
+                obj.__dict__["client"] = self.client
+
+        return {k: results[v] for k, v in self.grid_optimizations.items() if v in results}
+
     def get_final_energies(self, key: Union[int, str, None] = None) -> Dict[str, float]:
         """
         Provides the final optimized energies at each grid point.
@@ -379,11 +408,7 @@ class GridOptimizationRecord(RecordBase):
         """
 
         if "final_molecules" not in self.cache:
-            ret = {}
-            for k, task_id in self.grid_optimizations.items():
-                task = self.client.query_procedures(id=task_id)[0]
-                ret[k] = task.get_final_molecule()
-            self.cache["final_molecules"] = ret
+            self.cache["final_molecules"] = self._query_final("final_molecule")
 
         data = self.cache["final_molecules"]
         return self._organize_return(data, key)
@@ -414,22 +439,7 @@ class GridOptimizationRecord(RecordBase):
         """
 
         if "final_results" not in self.cache:
-            map_id_key = {}
-            ret = {}
-            for k, task_id in self.grid_optimizations.items():
-                task = self.client.query_procedures(id=task_id)[0]
-                if len(task.trajectory) > 0:
-                    final_grad_record_id = task.trajectory[-1]
-                    # store the id -> grid id mapping
-                    map_id_key[final_grad_record_id] = k
-            # combine the ids into one query
-            query_result_ids = list(map_id_key.keys())
-            # run the query on this batch
-            for grad_result_record in self.client.query_results(id=query_result_ids):
-                k = map_id_key[grad_result_record.id]
-                ret[k] = grad_result_record
-
-            self.cache["final_results"] = ret
+            self.cache["final_results"] = self._query_final("final_result")
 
         data = self.cache["final_results"]
 
@@ -1,12 +1,16 @@
 from typing import Any, Dict, Optional
 
 from .gridoptimization import GridOptimizationRecord
+from .model_utils import construct_model
 from .records import OptimizationRecord, ResultRecord
 from .torsiondrive import TorsionDriveRecord
 
 
 def build_procedure(
-    data: Dict[str, Any], procedure: Optional[str] = None, client: Optional["FractalClient"] = None
+    data: Dict[str, Any],
+    procedure: Optional[str] = None,
+    client: Optional["FractalClient"] = None,
+    validate: bool = True,
 ) -> "BaseRecord":
     """
     Constructs a Service ORM from incoming JSON data.
@@ -19,6 +23,8 @@ def build_procedure(
         The name of the procedure. If blank the procedure name is pulled from the `data["procedure"]` field.
     client : Optional['FractalClient'], optional
         A FractalClient connected to a server.
+    validate : bool, optional
+        Validates the data if True, otherwise the record is built from trusted data without validation.
 
     Returns
     -------
@@ -47,12 +53,19 @@ def build_procedure(
     # import json
     # print(json.dumps(data, indent=2))
     if data["procedure"].lower() == "single":
-        return ResultRecord(**data, client=client)
+        record_type = ResultRecord
     elif data["procedure"].lower() == "torsiondrive":
-        return TorsionDriveRecord(**data, client=client)
+        record_type = TorsionDriveRecord
     elif data["procedure"].lower() == "gridoptimization":
-        return GridOptimizationRecord(**data, client=client)
+        record_type = GridOptimizationRecord
     elif data["procedure"].lower() == "optimization":
-        return OptimizationRecord(**data, client=client)
+        record_type = OptimizationRecord
     else:
         raise KeyError("Service names {} not recognized.".format(data["procedure"]))
+
+    if validate:
+        return record_type(**data, client=client)
+
+    record = construct_model(record_type, data)
+    record.__dict__["client"] = client
+    return record
@@ -1,8 +1,13 @@
+import datetime
+import functools
 import hashlib
 import json
-from typing import Any, Dict, Optional
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Type, Union
 
 import numpy as np
+from pydantic import BaseModel
+from pydantic.datetime_parse import parse_datetime
 
 json_encoders = {np.ndarray: lambda v: v.flatten().tolist()}
 
@@ -76,3 +81,142 @@ def hash_dictionary(data: Dict[str, Any]) -> str:
     m = hashlib.sha1()
     m.update(json.dumps(data, sort_keys=True).encode("UTF-8"))
     return m.hexdigest()
+
+
+def construct_model(model: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    """
+    Builds a model and its nested models from trusted data without running pydantic validation
+
+    Only the conversions needed for the objects to behave as validated ones are applied: nested models
+    are built recursively, enums, datetimes and NumPy arrays are cast, and unknown keys are dropped.
+    Molecules are built with ``validate=False``, which still applies their pydantic field validators.
+    """
+    return _converter(model)(data)
+
+
+@functools.lru_cache(maxsize=None)
+def _converter(type_: Any) -> Callable[[Any], Any]:
+    """Returns a function that casts a trusted value to ``type_``, built once per type"""
+
+    origin = getattr(type_, "__origin__", None)
+    if origin is Union:
+        options = [(_matcher(arg), _converter(arg)) for arg in type_.__args__]
+
+        def convert(value):
+            for matches, convert_option in options:
+                if matches(value):
+                    return convert_option(value)
+            return value
+
+    elif origin is list:
+        item = _converter(type_.__args__[0])
+
+        def convert(value):
+            return [item(x) for x in value] if isinstance(value, list) else value
+
+    elif origin in (set, tuple):
+        convert = origin
+
+    elif origin is dict:
+        item = _converter(type_.__args__[1])
+
+        def convert(value):
+            return {k: item(v) for k, v in value.items()} if isinstance(value, dict) else value
+
+    elif not isinstance(type_, type):
+        return _identity
+
+    elif issubclass(type_, BaseModel):
+        return _model_converter(type_)
+
+    elif issubclass(type_, Enum):
+
+        def convert(value):
+            try:
+                return type_(value)
+            except ValueError:
+                return value
+
+    elif issubclass(type_, datetime.datetime):
+        convert = parse_datetime
+
+    elif issubclass(type_, np.ndarray):
+        dtype = getattr(type_, "_dtype", None)
+
+        def convert(value):
+            return np.asarray(value, dtype=dtype)
+
+    elif issubclass(type_, str):
+
+        def convert(value):
+            return str(value) if isinstance(value, int) else value
+
+    else:
+        return _identity
+
+    def convert_optional(value):
+        return None if value is None else convert(value)
+
+    return convert_optional
+
+
+def _model_converter(model: Type[BaseModel]) -> Callable[[Any], Any]:
+    from qcelemental.models import Molecule
+
+    if issubclass(model, Molecule):
+        return lambda value: model(**value, validate=False) if isinstance(value, dict) else value
+
+    # Immutable defaults are shared as pydantic would deep copy them on every construction
+    fields = [(name, field.alias, _converter(field.outer_type_)) for name, field in model.__fields__.items()]
+    defaults = {name: field.default for name, field in model.__fields__.items() if not field.required}
+
+    def convert(value):
+        if not isinstance(value, dict):
+            return value
+
+        values = {}
+        fields_set = set()
+        for name, alias, item in fields:
+            if alias in value:
+                values[name] = item(value[alias])
+                fields_set.add(name)
+            elif name in defaults:
+                default = defaults[name]
+                values[name] = default.copy() if isinstance(default, (dict, list, set)) else default
+
+        obj = model.__new__(model)
+        object.__setattr__(obj, "__dict__", values)
+        object.__setattr__(obj, "__fields_set__", fields_set)
+        return obj
+
+    return convert
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _matcher(type_: Any) -> Callable[[Any], bool]:
+    """Returns a cheap structural check used to pick a member of a Union"""
+    origin = getattr(type_, "__origin__", None)
+    if type_ is Any or (origin is None and not isinstance(type_, type)):
+        return lambda value: True
+    elif origin is list:
+        item = _matcher(type_.__args__[0])
+        return lambda value: isinstance(value, list) and (len(value) == 0 or item(value[0]))
+    elif origin in (set, tuple):
+        return lambda value: isinstance(value, (list, tuple, set))
+    elif origin is dict:
+        return lambda value: isinstance(value, dict)
+    elif origin is not None:
+        return lambda value: True
+    elif issubclass(type_, BaseModel):
+        required = {f.alias for f in type_.__fields__.values() if f.required}
+        return lambda value: isinstance(value, dict) and required <= value.keys()
+    elif issubclass(type_, np.ndarray):
+        return lambda value: isinstance(value, (list, np.ndarray))
+    elif type_ is float:
+        return lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    else:
+        return lambda value: isinstance(value, type_)
@@ -5,7 +5,7 @@ A model for Compute Records
 import abc
 import datetime
 from enum import Enum
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Union
 
 import numpy as np
 import qcelemental as qcel
@@ -203,7 +203,7 @@ class RecordBase(ProtoModel, abc.ABC):
         if field_name not in self.cache:
             # Decompress here, rather than later
             # that way, it is decompressed in the cache
-            kv = self.client.query_kvstore([oid])[oid]
+            kv = self.client._coalesced_get("kvstore", oid)
 
             if field_name == "error":
                 self.cache[field_name] = kv.get_json()
@@ -212,6 +212,59 @@ class RecordBase(ProtoModel, abc.ABC):
 
         return self.cache[field_name]
 
+    def _kvstore_iter(self, field_name: str, lines: bool) -> Iterator[str]:
+        """
+        Internal KVStore streaming object, the decompressed output is not cached
+        """
+        self.check_client()
+
+        oid = self.__dict__[field_name]
+        if oid is None:
+            return iter(())
+
+        # Already fully decompressed by a getter
+        if field_name in self.cache:
+            value = self.cache[field_name]
+            if not lines:
+                return iter([value])
+            return iter(value[:-1].split("\n") if value.endswith("\n") else value.split("\n"))
+
+        kv = self.client._coalesced_get("kvstore", oid)
+        return kv.iter_lines() if lines else kv.iter_chunks()
+
+    def iter_stdout(self, lines: bool = True) -> Iterator[str]:
+        """Streams the stdout from the denormalized KVStore, decompressing it incrementally.
+
+        Unlike ``get_stdout`` the output is not stored on the record, which keeps memory bounded for
+        very large outputs.
+
+        Parameters
+        ----------
+        lines : bool, optional
+            Yields lines (without line breaks) if True, otherwise yields chunks of text.
+
+        Returns
+        -------
+        Iterator[str]
+            The stdout, empty if no stdout is present.
+        """
+        return self._kvstore_iter("stdout", lines)
+
+    def iter_stderr(self, lines: bool = True) -> Iterator[str]:
+        """Streams the stderr from the denormalized KVStore, decompressing it incrementally.
+
+        Parameters
+        ----------
+        lines : bool, optional
+            Yields lines (without line breaks) if True, otherwise yields chunks of text.
+
+        Returns
+        -------
+        Iterator[str]
+            The stderr, empty if no stderr is present.
+        """
+        return self._kvstore_iter("stderr", lines)
+
     def get_stdout(self) -> Optional[str]:
         """Pulls the stdout from the denormalized KVStore and returns it to the user.
 
@@ -371,7 +424,7 @@ class ResultRecord(RecordBase):
             return None
 
         if "molecule" not in self.cache:
-            self.cache["molecule"] = self.client.query_molecules(id=self.molecule)[0]
+            self.cache["molecule"] = self.client._coalesced_get("molecule", self.molecule)
 
         return self.cache["molecule"]
 
@@ -486,8 +539,7 @@ class OptimizationRecord(RecordBase):
             The initial molecule
         """
 
-        ret = self.client.query_molecules(id=[self.initial_molecule])
-        return ret[0]
+        return self.client._coalesced_get("molecule", self.initial_molecule)
 
     def get_final_molecule(self) -> "Molecule":
         """Returns the optimized molecule
@@ -498,8 +550,7 @@ class OptimizationRecord(RecordBase):
             The optimized molecule
         """
 
-        ret = self.client.query_molecules(id=[self.final_molecule])
-        return ret[0]
+        return self.client._coalesced_get("molecule", self.final_molecule)
 
     ## Show functions
 
@@ -32,3 +32,56 @@ def test_recursive_normalizer_array():
 
     assert np.array_equal(bench["hello"], norm1["hello"])
     assert np.array_equal(bench["hello"], norm2["hello"])
+
+
+def _result_response_payload(n):
+    from qcelemental.util import deserialize, serialize
+
+    record = {
+        "procedure": "single",
+        "program": "psi4",
+        "version": 1,
+        "driver": "gradient",
+        "method": "b3lyp",
+        "basis": "6-31g",
+        "molecule": "5c5bb1a7e5b1f86f2d4b7b5f",
+        "status": "COMPLETE",
+        "modified_on": "2019-05-01T12:00:00",
+        "created_on": "2019-05-01T12:00:00",
+        "return_result": np.arange(30, dtype=float).reshape(-1, 3),
+        "properties": {"scf_total_energy": -1.5, "calcinfo_nbasis": 10},
+        "provenance": {"creator": "psi4", "version": "1.3", "routine": "psi4.run"},
+        "extras": {},
+    }
+    data = [{**record, "id": f"5c5bb1a7e5b1f86f2d4b{i:04x}"} for i in range(n)]
+    meta = {"errors": [], "success": True, "error_description": False, "missing": [], "n_found": n}
+
+    # Round-trip through the wire format so that arrays arrive as they do from a server
+    return deserialize(serialize({"meta": meta, "data": data}, "msgpack-ext"), "msgpack-ext")
+
+
+def test_construct_model_matches_validation():
+    from ..model_utils import construct_model
+    from ..records import RecordStatusEnum
+    from ..rest_models import ResultGETResponse
+
+    payload = _result_response_payload(3)
+
+    validated = ResultGETResponse.parse_obj(payload)
+    constructed = construct_model(ResultGETResponse, payload)
+
+    assert constructed.meta.success is validated.meta.success
+    assert constructed.meta.n_found == validated.meta.n_found
+    for v, c in zip(validated.data, constructed.data):
+        assert type(c) is type(v)
+        assert c.status is RecordStatusEnum.complete
+        assert c.modified_on == v.modified_on
+        assert c.properties.scf_total_energy == v.properties.scf_total_energy
+        assert c.provenance.creator == v.provenance.creator
+        assert isinstance(c.return_result, np.ndarray)
+        assert c.dict(encoding="json") == v.dict(encoding="json")
+
+    # Projected queries return plain dictionaries which must not be turned into records
+    payload["data"] = [{"id": x["id"], "return_result": 5.0} for x in payload["data"]]
+    assert construct_model(ResultGETResponse, payload).data == ResultGETResponse.parse_obj(payload).data
+
@@ -116,6 +116,7 @@ class TorsionDriveRecord(RecordBase):
 
     # Class data
     _hash_indices = {"initial_molecule", "keywords", "optimization_spec", "qc_spec"}
+    _history_key = "history"
 
     # Version data
     version: int = Field(1, description="The version number of the Record.")
@@ -239,26 +240,35 @@ class TorsionDriveRecord(RecordBase):
         if "history" not in self.cache:
 
             # Grab procedures
-            needed_ids = [x for v in self.optimization_history.values() for x in v]
-            objects = []
-            for i in range(0, len(needed_ids), self.client.query_limit):
-                objects.extend(self.client.query_procedures(id=needed_ids[i : i + self.client.query_limit]))
-            procedures = {v.id: v for v in objects}
+            procedures = {}
+            for chunk in self.client._chunked_map(
+                lambda ids: self.client.query_procedures(id=ids), self._history_ids()
+            ):
+                procedures.update((x.id, x) for x in chunk)
 
-            # Move procedures into the correct order
-            ret = {}
-            for okey, hashes in self.optimization_history.items():
-                tmp = []
-                for h in hashes:
-                    tmp.append(procedures[h])
-                ret[okey] = tmp
-
-            self.cache["history"] = ret
+            self._set_history(procedures)
 
         data = self.cache["history"]
 
         return self._organize_return(data, key, minimum=minimum)
 
+    def _history_ids(self) -> List[ObjectId]:
+        """Returns the ids of all optimizations in the history"""
+        return [x for v in self.optimization_history.values() for x in v]
+
+    def _set_history(self, procedures: Dict[str, Any]) -> None:
+        """Fills the history cache from a {id: procedure} map, which may be shared between records"""
+
+        # Move procedures into the correct order
+        ret = {}
+        for okey, hashes in self.optimization_history.items():
+            tmp = []
+            for h in hashes:
+                tmp.append(procedures[h])
+            ret[okey] = tmp
+
+        self.cache["history"] = ret
+
     def get_final_energies(self, key: Union[int, Tuple[int, ...], str] = None) -> Dict[str, float]:
         """
         Provides the final optimized energies at each grid point.
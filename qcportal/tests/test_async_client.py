@@ -0,0 +1,46 @@
+"""
+Tests the AsyncFractalClient against a mocked transport
+"""
+
+import asyncio
+
+import pytest
+from qcelemental.util import deserialize
+
+import qcportal as portal
+from qcportal.models.rest_models import rest_model
+
+httpx = pytest.importorskip("httpx")
+
+
+def _mock_client():
+    mols = {str(i): portal.Molecule(symbols=["He"], geometry=[0, 0, i], id=str(i)) for i in range(1, 10)}
+    headers = {"Content-Type": "application/msgpack-ext"}
+
+    def handler(request):
+        _, response_model = rest_model(request.url.path.strip("/"), request.method.lower())
+
+        ids = deserialize(request.content, "msgpack-ext")["data"]["id"]
+        meta = {"errors": [], "success": True, "error_description": False, "missing": [], "n_found": len(ids)}
+        response = response_model(meta=meta, data=[mols[x] for x in ids])
+        return httpx.Response(200, content=response.serialize("msgpack-ext"), headers=headers)
+
+    client = portal.AsyncFractalClient("http://localhost:7777")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    return client
+
+
+def test_async_client_gather_chunks():
+    async def run():
+        client = _mock_client()
+        ids = [str(i) for i in range(1, 8)]
+
+        chunks = await client.gather_chunks(lambda x: client.query_molecules(id=x), ids, chunk_size=2)
+        await client.close()
+        return chunks
+
+    chunks = asyncio.run(run())
+
+    assert [len(x) for x in chunks] == [2, 2, 2, 1]
+    assert [mol.id for chunk in chunks for mol in chunk] == [str(i) for i in range(1, 8)]
@@ -0,0 +1,199 @@
+"""
+Tests the in-memory and on-disk object caches
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+import qcportal as portal
+from qcportal.cache import DiskCache, IdentityMap
+from qcportal.models import ResultRecord
+from qcportal.tests import test_helper as th
+
+
+def _molecule(i):
+    return portal.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, i + 2], id=str(i))
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    mols = [_molecule(i) for i in range(3)]
+
+    cache.put("http://a/", "molecule", mols)
+    found = cache.get("http://a/", "molecule", ["0", "2", "5"])
+
+    assert set(found) == {"0", "2"}
+    assert found["2"] == mols[2]
+    assert cache.get("http://b/", "molecule", ["0"]) == {}
+    assert cache.get("http://a/", "result", ["0"]) == {}
+
+    # Persisted across instances
+    cache.close()
+    assert set(DiskCache(str(tmp_path)).get("http://a/", "molecule", ["0", "1"])) == {"0", "1"}
+
+
+def test_disk_cache_versions_and_corrupt_entries(tmp_path):
+    old = DiskCache(str(tmp_path), version="0.1")
+    old.put("http://a/", "molecule", [_molecule(0), _molecule(1)])
+
+    # Objects stored by other versions are not visible
+    cache = DiskCache(str(tmp_path))
+    assert cache.get("http://a/", "molecule", ["0"]) == {}
+
+    cache.put("http://a/", "molecule", [_molecule(0), _molecule(1)])
+    cache._conn.execute("UPDATE objects SET data = ? WHERE version = ? AND id = ?", [b"garbage", cache.version, "1"])
+
+    # Unloadable objects are misses and removed
+    total = cache.size()
+    assert set(cache.get("http://a/", "molecule", ["0", "1"])) == {"0"}
+    assert cache.size() < total
+    assert cache._total == cache.size()
+
+
+def test_disk_cache_running_total(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put("http://a/", "molecule", [_molecule(0), _molecule(1)])
+    cache.put("http://a/", "molecule", [_molecule(1)])
+    assert cache._total == cache.size()
+
+    # Reopened caches pick up the stored total
+    assert DiskCache(str(tmp_path))._total == cache.size()
+
+    cache.clear()
+    assert cache._total == cache.size() == 0
+
+
+def test_client_query_served_from_disk_cache(tmp_path):
+    requests = []
+
+    def make_client():
+        client = th.offline_client(10, cache_dir=str(tmp_path))
+
+        def automodel_request(name, rest, payload, full_return=False):
+            requests.append(payload["data"]["id"])
+            return SimpleNamespace(data=[_molecule(int(x)) for x in payload["data"]["id"]])
+
+        client._automodel_request = automodel_request
+        return client
+
+    first = make_client().query_molecules(id=["0", "1"])
+    assert requests == [["0", "1"]]
+
+    # A fresh client is served from disk and only requests the missing id
+    second = make_client().query_molecules(id=["1", "0", "2"])
+    assert [x.id for x in second] == ["1", "0", "2"]
+    assert second[0] == first[1]
+    assert requests == [["0", "1"], ["2"]]
+
+    make_client().query_molecules(id=["2", "0"])
+    assert len(requests) == 2
+
+
+def test_disk_cache_record_strips_client(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    record = ResultRecord(
+        id="1", program="psi4", driver="energy", method="hf", basis="sto-3g", molecule="5", status="COMPLETE"
+    )
+    record.__dict__["client"] = object()
+    record.cache["molecule"] = _molecule(5)
+
+    cache.put("http://a/", "result", [record])
+    ret = cache.get("http://a/", "result", ["1"])["1"]
+
+    assert ret.client is None
+    assert ret.cache == {}
+    assert ret.method == "hf"
+    assert record.client is not None
+
+
+def test_disk_cache_lru_eviction(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    cache.put("http://a/", "molecule", [_molecule(0)])
+    cache.max_size = cache.size() * 2
+
+    cache.put("http://a/", "molecule", [_molecule(1)])
+    cache.get("http://a/", "molecule", ["0"])
+    cache.put("http://a/", "molecule", [_molecule(2)])
+
+    assert set(cache.get("http://a/", "molecule", ["0", "1", "2"])) == {"0", "2"}
+    assert cache.size() <= cache.max_size
+
+
+def test_disk_cache_server_info_ttl(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.put_server_info("http://a/", {"name": "a", "query_limit": 10})
+
+    assert cache.get_server_info("http://a/", ttl=60) == {"name": "a", "query_limit": 10}
+    assert cache.get_server_info("http://a/", ttl=-1) is None
+    assert cache.get_server_info("http://b/", ttl=60) is None
+
+
+def test_lazy_client_defers_handshake(tmp_path):
+    client = portal.FractalClient("http://localhost:1", lazy=True, cache_dir=str(tmp_path), server_info_ttl=60)
+    assert "localhost:1" in repr(client)
+
+    with pytest.raises(ConnectionRefusedError):
+        client.query_limit
+
+
+def test_identity_map_shares_objects():
+    imap = IdentityMap(max_entries=2)
+    first = imap.canonicalize("molecule", [_molecule(0), _molecule(1)])
+
+    # Known ids resolve to the held instance, new ones are held
+    again = imap.canonicalize("molecule", [_molecule(0), _molecule(2)])
+    assert again[0] is first[0]
+    assert imap.get("result", ["0"]) == {}
+
+    # The least recently used id was dropped
+    assert set(imap.get("molecule", ["0", "1", "2"])) == {"0", "2"}
+    assert len(imap) == 2
+
+
+def _record(i, status):
+    return ResultRecord(
+        id=str(i), program="psi4", driver="energy", method="hf", basis="sto-3g", molecule="5", status=status
+    )
+
+
+def test_client_identity_map_query_by_id():
+    requests = []
+
+    def automodel_request(name, rest, payload, full_return=False):
+        requests.append(payload["data"]["id"])
+        return SimpleNamespace(data=[_molecule(int(x)) for x in payload["data"]["id"]])
+
+    # Off by default, every query returns new objects
+    client = th.offline_client(10)
+    client._automodel_request = automodel_request
+    assert client._identity_map is None
+    assert client.query_molecules(id=["0"])[0] is not client.query_molecules(id=["0"])[0]
+
+    requests.clear()
+    client = th.offline_client(10, identity_map_size=10)
+    client._automodel_request = automodel_request
+
+    # Duplicate ids are requested and returned once, in the order first requested
+    first = client.query_molecules(id=["1", "0", "1"])
+    assert [x.id for x in first] == ["1", "0"]
+    assert requests == [["1", "0"]]
+
+    # Held ids are reused without a request
+    second = client.query_molecules(id=["2", "0"])
+    assert [x.id for x in second] == ["2", "0"]
+    assert second[1] is first[1]
+    assert requests == [["1", "0"], ["2"]]
+
+
+def test_client_identity_map_canonicalize():
+    client = th.offline_client(identity_map_size=10)
+
+    complete = client._canonicalize("result", [_record(0, "COMPLETE"), _record(1, "INCOMPLETE")])
+    again = client._canonicalize("result", [_record(1, "INCOMPLETE"), _record(0, "COMPLETE")])
+
+    # Only COMPLETE records are shared, the order of the objects is kept
+    assert [x.id for x in again] == ["1", "0"]
+    assert again[1] is complete[0]
+    assert again[0] is not complete[1]
+    assert len(client._identity_map) == 1
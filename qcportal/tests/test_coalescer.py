@@ -0,0 +1,57 @@
+"""
+Tests the batching of single-object lookups
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qcportal.coalescer import RequestCoalescer
+
+
+def test_coalescer_batches_concurrent_lookups():
+    calls = []
+    gate = threading.Event()
+
+    def fetch(keys):
+        calls.append(list(keys))
+        gate.wait(5)
+        return {k: k * 2 for k in keys if k >= 0}
+
+    coalescer = RequestCoalescer(fetch, batch_size=4)
+
+    keys = [0, 1, 2, 3, 4, 5, 1, 1]
+    with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+        futures = [executor.submit(coalescer.get, k) for k in keys]
+
+        # Let the remaining lookups pile up behind the first in-flight batch
+        deadline = time.time() + 5
+        while len(coalescer._futures) < 6 and time.time() < deadline:
+            time.sleep(0.001)
+        gate.set()
+
+        assert [f.result() for f in futures] == [k * 2 for k in keys]
+
+    # Every id is requested exactly once and no batch exceeds the limit
+    assert sorted(k for c in calls for k in c) == [0, 1, 2, 3, 4, 5]
+    assert all(len(c) <= 4 for c in calls)
+    assert len(calls) < len(keys)
+
+
+def test_coalescer_missing_and_errors():
+    coalescer = RequestCoalescer(lambda keys: {}, batch_size=10)
+    with pytest.raises(KeyError):
+        coalescer.get("a")
+
+    def fail(keys):
+        raise ConnectionRefusedError("down")
+
+    coalescer = RequestCoalescer(fail, batch_size=10)
+    with pytest.raises(ConnectionRefusedError):
+        coalescer.get("a")
+
+    # The coalescer recovers for later lookups
+    assert coalescer._running is False
+    assert coalescer._futures == {}
@@ -2,6 +2,9 @@
 Tests the QCPortal dataset object
 """
 
+import time
+
+import pandas as pd
 import pytest
 
 from . import portal
@@ -241,3 +244,371 @@ def test_database_history():
     assert ds.list_records(program="P1").shape[0] == 4
     assert ds.list_records(basis="None").shape[0] == 3
     assert ds.list_records(keywords="None").shape[0] == 1
+
+
+def test_add_molecules_by_dict_concurrent():
+    client = th.offline_client(2, max_workers=4)
+
+    # Later chunks finish first, the hash -> id mapping must not depend on completion order
+    def add_molecules(mols):
+        time.sleep(0.01 * (10 - int(mols[0].id)))
+        return [f"server-{x.id}" for x in mols]
+
+    client.add_molecules = add_molecules
+
+    molecules = {f"hash-{i}": portal.Molecule(symbols=["He"], geometry=[0, 0, i], id=str(i)) for i in range(7)}
+    ret = portal.collections.Dataset._add_molecules_by_dict(client, molecules)
+
+    assert list(ret.items()) == [(f"hash-{i}", f"server-{i}") for i in range(7)]
+
+
+def test_optimization_dataset_batched_compute():
+    client = th.offline_client(2, max_workers=2)
+
+    calls = []
+
+    def add_procedure(procedure, program, program_options, molecule, priority=None, tag=None):
+        calls.append((program_options["keywords"], molecule))
+        ids = [str(100 + int(x)) for x in molecule]
+        return portal.models.rest_models.ComputeResponse(ids=ids, submitted=[], existing=[])
+
+    client.add_procedure = add_procedure
+
+    ds = portal.collections.OptimizationDataset("batched", client=client)
+    saves = []
+    ds.save = lambda: saves.append(True)
+    ds.add_specification(
+        "default",
+        {"program": "geometric", "keywords": {"coordsys": "tric"}},
+        {"driver": "gradient", "method": "hf", "basis": "sto-3g", "program": "psi4"},
+    )
+    for i in range(5):
+        keywords = {"maxiter": 10} if i == 2 else {}
+        ds.data.records[f"mol{i}"] = portal.collections.optimization_dataset.OptEntry(
+            name=f"mol{i}", initial_molecule=str(i), additional_keywords=keywords
+        )
+
+    assert ds.compute("default") == 5
+    assert {x.name: x.object_map["default"] for x in ds.data.records.values()} == {
+        f"mol{i}": str(100 + i) for i in range(5)
+    }
+    assert len(saves) == 2
+
+    # Overridden keywords form their own request, the other entries are split into query_limit sized requests
+    assert sorted(calls, key=lambda x: x[1]) == [
+        ({"coordsys": "tric"}, ["0", "1"]),
+        ({"coordsys": "tric", "maxiter": 10}, ["2"]),
+        ({"coordsys": "tric"}, ["3", "4"]),
+    ]
+
+
+def test_optimization_dataset_add_entries():
+    client = th.offline_client(100)
+
+    uploads = []
+
+    def add_molecules(mols):
+        uploads.append(len(mols))
+        return [str(100 + int(x.geometry[1, 2])) for x in mols]
+
+    client.add_molecules = add_molecules
+
+    ds = portal.collections.OptimizationDataset("bulk", client=client)
+    saves = []
+    ds.save = lambda: saves.append(True)
+
+    mols = [portal.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, i % 2 + 2]) for i in range(4)]
+    ds.add_entries(["a", "b", "c", "d"], mols, attributes=[{"x": 1}, None, None, None])
+
+    # Identical molecules are uploaded once and the collection is saved once
+    assert uploads == [2]
+    assert len(saves) == 1
+    assert [ds.get_entry(x).initial_molecule for x in "abcd"] == ["102", "103", "102", "103"]
+    assert ds.get_entry("a").attributes == {"x": 1}
+
+    with pytest.raises(KeyError):
+        ds.add_entries(["e", "a"], mols[:2])
+    with pytest.raises(ValueError):
+        ds.add_entries(["e", "f"], mols[:1])
+    assert "e" not in ds.data.records
+
+
+def test_dataset_compute_many():
+    client = th.offline_client(2, max_workers=4)
+
+    calls = []
+
+    def add_compute(program, method, basis, driver, keywords, molecule, **kwargs):
+        calls.append((program, method, basis, tuple(molecule)))
+        ids = [str(100 + int(x)) for x in molecule]
+        return portal.models.rest_models.ComputeResponse(ids=ids, submitted=ids, existing=[])
+
+    client.add_compute = add_compute
+
+    ds = portal.collections.Dataset("grid", client=client, default_program="psi4")
+    ds.save = lambda: None
+    for i in range(3):
+        ds.data.records.append(portal.collections.dataset.MoleculeEntry(name=f"mol{i}", molecule_id=str(i)))
+
+    specs = [{"method": m, "basis": b} for m in ["b3lyp-d3", "pbe0-d3"] for b in ["svp", "tzvp"]]
+    ret = ds.compute_many(specs)
+
+    # The shared dftd3 stage of each method is only submitted once across both basis sets
+    stages = {x[:3] for x in calls}
+    assert len(stages) == 6
+    assert ("dftd3", "b3lyp-d3", None) in stages
+    assert len(calls) == 12
+    assert len(ret.ids) == 18
+    assert len(ds.data.history) == 6
+
+    with pytest.raises(KeyError):
+        ds.compute_many([{"basis": "svp"}])
+
+
+def test_procedure_dataset_prefetch_history():
+    client = th.offline_client(100)
+
+    calls = []
+
+    def query_procedures(id, status="COMPLETE"):
+        calls.append(id)
+        return [portal.models.OptimizationRecord.construct(id=x, status="COMPLETE") for x in id]
+
+    client.query_procedures = query_procedures
+
+    records = [
+        portal.models.GridOptimizationRecord.construct(
+            grid_optimizations={"[0]": "1", "[1]": str(i + 2)}, cache={}, client=client
+        )
+        for i in range(3)
+    ]
+
+    ds = portal.collections.OptimizationDataset("prefetch", client=client)
+    ds._prefetch_history(records + [portal.models.OptimizationRecord.construct(id="9", cache={})])
+
+    # All histories are fetched in one request and shared ids map to the same record
+    assert calls == [["1", "2", "3", "4"]]
+    assert records[0].get_history((0,)).id == "1"
+    assert records[0].cache["optimization_history"]["[0]"] is records[2].cache["optimization_history"]["[0]"]
+
+    ds._prefetch_history(records)
+    assert len(calls) == 1
+
+
+def test_procedure_dataset_detailed_status():
+    from ..collections.torsiondrive_dataset import TDEntry, TDEntrySpecification
+    from ..models.records import RecordStatusEnum as status
+    from ..models.torsiondrive import TDKeywords
+
+    client = th.offline_client(100)
+
+    opts = {
+        "1": portal.models.OptimizationRecord.construct(id="1", status=status.complete),
+        "2": portal.models.OptimizationRecord.construct(id="2", status=status.error),
+        "3": portal.models.OptimizationRecord.construct(id="3", status=status.running),
+    }
+    td = portal.models.TorsionDriveRecord.construct(
+        id="10",
+        status=status.running,
+        keywords=TDKeywords(dihedrals=[(0, 1, 2, 3)], grid_spacing=[90]),
+        optimization_history={"[0]": ["1", "2"], "[90]": ["3"]},
+        cache={},
+        client=client,
+    )
+
+    calls = []
+
+    def query_procedures(id, status="COMPLETE"):
+        calls.append(id)
+        procs = [opts.get(x, td) for x in id]
+        return [x for x in procs if status is None or x.status == status]
+
+    client.query_procedures = query_procedures
+
+    ds = portal.collections.TorsionDriveDataset("detail", client=client)
+    ds.data.specs["default"] = TDEntrySpecification.construct(name="default")
+    ds.data.records["td0"] = TDEntry.construct(name="td0", object_map={"default": "10"})
+
+    df = ds.status("default", detail=True)
+    assert calls == [["10"], ["1", "2", "3"]]
+    assert df.loc["td0", "Complete Tasks"] == 1
+    assert df.loc["td0", "Error Tasks"] == 1
+    assert df.loc["td0", "Incomplete Tasks"] == 1
+
+
+def test_optimization_dataset_get_trajectories():
+    client = th.offline_client(3)
+
+    calls = []
+
+    def query_results(id, include):
+        calls.append(("result", id, include))
+        # Older records may lack a return_energy, energies are taken from the optimizations instead
+        return [{"id": x, "molecule": str(int(x) % 2), "properties": {}, "return_result": [0] * 6} for x in id]
+
+    def query_molecules(id):
+        calls.append(("molecule", id))
+        return [portal.Molecule(symbols=["He", "He"], geometry=[0, 0, 0, 0, 0, int(x) + 2], id=x) for x in id]
+
+    client.query_results = query_results
+    client.query_molecules = query_molecules
+
+    ds = portal.collections.OptimizationDataset("traj", client=client)
+    ds.data.specs["default"] = portal.collections.optimization_dataset.OptEntrySpecification.construct(name="default")
+    opts = {
+        "a": portal.models.OptimizationRecord.construct(
+            status="COMPLETE", trajectory=["10", "11", "12"], energies=[-10, -11, -12]
+        ),
+        "b": portal.models.OptimizationRecord.construct(
+            status="COMPLETE", trajectory=["13", "14"], energies=[-13, -14]
+        ),
+        "c": portal.models.OptimizationRecord.construct(status="INCOMPLETE", trajectory=["15"], energies=[]),
+    }
+    ds.df["default"] = pd.Series(opts)
+
+    df = ds.get_trajectories("default")
+
+    assert list(df.index) == [("a", 0), ("a", 1), ("a", 2), ("b", 0), ("b", 1)]
+    assert df.loc[("b", 1), "energy"] == -14
+    assert df.loc[("a", 0), "gradient"].shape == (2, 3)
+    assert df.loc[("a", 1), "geometry"][1, 2] == 3
+
+    # Results are fetched in query_limit chunks with a projection, molecules once per unique id
+    assert [len(x[1]) for x in calls] == [3, 2, 2]
+    assert calls[0][2] == ["id", "molecule", "return_result"]
+
+    # Energies alone need no result queries
+    calls.clear()
+    df = ds.get_trajectories("default", fields=["energy"], entries="b")
+    assert list(df.columns) == ["energy"]
+    assert df["energy"].tolist() == [-13, -14]
+    assert calls == []
+    with pytest.raises(KeyError):
+        ds.get_trajectories("default", fields=["hessian"])
+
+
+def test_dataset_value_store():
+    import numpy as np
+
+    from ..collections.value_store import ValueStore
+
+    store = ValueStore()
+    store.update(pd.DataFrame({"energy": [1.0, np.nan]}, index=["a", "b"]))
+    store.update(
+        pd.DataFrame({"energy": [2.0], "gradient": [np.arange(6.0).reshape(2, 3)], "label": ["x"]}, index=["b"])
+    )
+    store.update(pd.DataFrame({"gradient": [np.ones((1, 3))]}, index=["c"]))
+
+    assert store.index == ["a", "b", "c"]
+    assert store._columns["energy"].kind == "scalar"
+    assert store._columns["gradient"].kind == "ragged"
+    assert store._columns["label"].kind == "object"
+
+    assert store.has_values("energy", ["a", "b"])
+    assert not store.has_values("energy", ["a", "c"])
+    assert not store.has_values("energy", ["missing"])
+
+    df = store.frame(["c", "b"], ["energy", "gradient"])
+    assert list(df.index) == ["c", "b"]
+    assert df["energy"].dtype == np.float64
+    assert np.isnan(df.loc["c", "energy"])
+    assert df.loc["b", "energy"] == 2.0
+    assert df.loc["b", "gradient"].shape == (2, 3)
+    assert df.loc["c", "gradient"].tolist() == [[1.0, 1.0, 1.0]]
+
+    # Scaling leaves earlier handed out arrays alone
+    grad = df.loc["b", "gradient"]
+    store.scale("gradient", 2.0)
+    assert grad[1, 2] == 5.0
+    assert store.series("gradient")["b"][1, 2] == 10.0
+
+    # Integers and booleans keep their type
+    store.update(pd.DataFrame({"n": [1, 2], "flag": [True, False]}, index=["a", "b"]))
+    assert store._columns["n"].kind == "object"
+    assert store._columns["flag"].kind == "object"
+    assert store.series("n", ["a", "b"]).tolist() == [1, 2]
+    assert store.series("n", ["a", "b"]).dtype == np.int64
+    assert store.series("flag", ["a", "b"]).tolist() == [True, False]
+    assert store.frame(["a", "b"], ["flag"])["flag"].dtype == bool
+    assert store.frame(["a", "b"], ["energy", "n"])["energy"].dtype == np.float64
+
+    # Mixing kinds within a column falls back to objects
+    store.update(pd.DataFrame({"energy": ["n/a"]}, index=["c"]))
+    assert store._columns["energy"].kind == "object"
+    assert store.series("energy").tolist()[:2] == [1.0, 2.0]
+
+    ds = portal.collections.Dataset("tmp")
+    ds._update_cache(pd.DataFrame({"energy": [1.0]}, index=["a"]))
+    assert ds._subset_in_cache("energy", {"a"})
+    assert ds["energy"]["a"] == 1.0
+    assert list(ds.df.columns) == ["energy"]
+
+    ds._update_cache(pd.DataFrame({"n": [1], "flag": [True]}, index=["a"]))
+    assert ds["n"].tolist() == [1]
+    assert ds["flag"].tolist() == [True]
+
+
+def test_dataset_df_cached_and_writable():
+    ds = portal.collections.Dataset("tmp")
+    ds._update_cache(pd.DataFrame({"energy": [1.0, 2.0]}, index=["a", "b"]))
+
+    # The frame is built once until the store changes
+    df = ds.df
+    assert ds.df is df
+
+    # Reading the frame does not rebuild the store
+    store = ds._value_store
+    assert ds["energy"]["a"] == 1.0
+    assert ds.df is df
+
+    # Added columns are taken over, values are written back explicitly
+    ds.df["label"] = ["x", "y"]
+    ds["energy"] = [5.0, 2.0]
+    assert ds["energy"].tolist() == [5.0, 2.0]
+    assert ds["label"]["b"] == "y"
+
+    ds._update_cache(pd.DataFrame({"gradient": [[0.0, 0.0, 1.0]]}, index=["c"]))
+    assert ds._value_store is store
+    df = ds.df
+    assert list(df.columns) == ["energy", "label", "gradient"]
+    assert df.loc["a", "energy"] == 5.0
+    assert df.loc["c", "gradient"].tolist() == [0.0, 0.0, 1.0]
+
+    del ds.df["label"]
+    assert "label" not in ds._values
+
+
+def test_reaction_dataset_entry_index():
+    from ..collections.reaction_dataset import ReactionEntry
+
+    ds = portal.collections.ReactionDataset("tmp", ds_type="ie")
+
+    def rxn(name, mols):
+        stoich = {"default": {m: 1.0 for m in mols}, "cp": {m + "-cp": -1.0 for m in mols}}
+        return ReactionEntry(name=name, stoichiometry=stoich, attributes={}, reaction_results={})
+
+    ds.data.records.extend([rxn("r0", ["1", "2"]), rxn("r1", ["3"])])
+
+    index = ds._get_entry_index()
+    assert ds._get_entry_index() is index
+    assert len(ds.get_entries()) == 6
+    assert ds.get_entries(subset=["r1"])["molecule"].tolist() == ["3", "3-cp"]
+    assert ds.get_rxn("r1").name == "r1"
+
+    indexer, names = ds._molecule_indexer("cp", subset={"r0"})
+    assert names == ("name", "stoichiometry", "idx")
+    assert indexer == {("r0", "cp", 0): "1-cp", ("r0", "cp", 1): "2-cp"}
+
+    # Appended records extend the same index
+    ds.data.records.append(rxn("r2", ["4"]))
+    assert ds._get_entry_index() is index
+    assert ds.get_rxn("r2").name == "r2"
+    assert ds._molecule_indexer("default")[0][("r2", "default", 0)] == "4"
+
+    with pytest.raises(KeyError):
+        ds.get_rxn("missing")
+
+    # Replaced records rebuild the index
+    ds.data.__dict__["records"] = [rxn("r3", ["5"])]
+    assert ds._get_entry_index() is not index
+    assert ds.get_index() == ["r3"]
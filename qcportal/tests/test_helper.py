@@ -14,3 +14,15 @@ def compare_lists(bench, val):
         return False
 
     return True
+
+
+def offline_client(query_limit=1000, **kwargs):
+    """
+    Returns a lazy FractalClient which never contacts a server. The server handshake is filled in with the
+    given query limit, tests then replace the query methods they exercise with canned responses.
+    """
+    from . import portal
+
+    client = portal.FractalClient("localhost:1", lazy=True, **kwargs)
+    client._server_info, client._query_limit = {}, query_limit
+    return client
@@ -1,6 +1,7 @@
 import pytest
 
 from . import portal
+from . import test_helper as th
 
 
 def test_kvstore_model_fail():
@@ -19,3 +20,67 @@ def test_kvstore_model_fail():
     # data is a string, but compression level is not 0
     with pytest.raises(ValueError, match=r"Compression level is set, but input is a"):
         portal.models.KVStore(**{"data": {"123": 123}, "compression_level": 1})
+
+
+def test_gridoptimization_final_queries_batched():
+    client = th.offline_client(2, max_workers=2)
+
+    calls = []
+
+    def custom_query(object_name, query_type, data):
+        calls.append((query_type, data["optimization_ids"]))
+        if query_type == "final_molecule":
+            return {x: portal.Molecule(symbols=["He"], geometry=[0, 0, int(x)]) for x in data["optimization_ids"]}
+
+        return {
+            x: portal.models.ResultRecord(
+                id=x, program="psi4", driver="gradient", method="hf", basis="sto-3g", molecule=x, status="COMPLETE"
+            )
+            for x in data["optimization_ids"]
+            if x != "3"
+        }
+
+    client.custom_query = custom_query
+
+    grid = {f"[{i}]": str(i) for i in range(5)}
+    record = portal.models.GridOptimizationRecord.construct(grid_optimizations=grid, cache={}, client=client)
+
+    mols = record.get_final_molecules()
+    assert len(mols) == 5
+    assert mols[(3,)].geometry[0, 2] == 3
+
+    results = record.get_final_results()
+    assert set(results) == {(0,), (1,), (2,), (4,)}
+    assert results[(4,)].client is client
+
+    # One request per query_limit chunk rather than one per grid point
+    assert [len(ids) for query_type, ids in calls] == [2, 2, 1, 2, 2, 1]
+
+
+@pytest.mark.parametrize("compression", list(portal.models.CompressionEnum))
+def test_kvstore_iter_lines(compression):
+    text = "\n".join(f"line {i} åß" for i in range(5000)) + "\n"
+    kv = portal.models.KVStore.compress(text, compression)
+
+    # Small chunks split lines and multi-byte characters
+    assert "".join(kv.iter_chunks(chunk_size=37)) == text
+    assert max(len(x) for x in kv.iter_chunks(chunk_size=37)) <= 37
+    assert list(kv.iter_lines(chunk_size=37)) == text.split("\n")[:-1]
+
+
+def test_record_iter_stdout():
+    kv = portal.models.KVStore.compress("a\nb\nc", portal.models.CompressionEnum.gzip)
+
+    class Client:
+        def _coalesced_get(self, kind, oid):
+            assert (kind, oid) == ("kvstore", "7")
+            return kv
+
+    record = portal.models.ResultRecord(
+        id="1", program="psi4", driver="energy", method="hf", basis="sto-3g", molecule="5", stdout="7"
+    )
+    record.__dict__["client"] = Client()
+
+    assert list(record.iter_stdout()) == ["a", "b", "c"]
+    assert "stdout" not in record.cache
+    assert list(record.iter_stderr()) == []
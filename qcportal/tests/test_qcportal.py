@@ -6,7 +6,271 @@ Unit and regression test for the qcportal package.
 import qcportal
 import pytest
 import sys
+from qcportal.tests import test_helper as th
 
 def test_qcportal_imported():
     """Sample test, will always pass so long as import statement worked"""
     assert "qcportal" in sys.modules
+
+
+def test_client_metrics():
+    from qcportal.metrics import ClientMetrics
+
+    events = []
+    metrics = ClientMetrics()
+    metrics.add_hook(events.append)
+
+    metrics.record("molecule", "get", latency=0.02, bytes_sent=10, bytes_received=100, decode_time=0.001)
+    metrics.record("molecule", "get", latency=20.0, error=True)
+    metrics.record("result", "get", latency=0.2, validation_time=0.05)
+
+    snap = metrics.snapshot()
+    assert snap[("molecule", "get")]["requests"] == 2
+    assert snap[("molecule", "get")]["errors"] == 1
+    assert snap[("molecule", "get")]["bytes_received"] == 100
+    assert snap[("molecule", "get")]["latency_histogram"][0.025] == 1
+    assert snap[("molecule", "get")]["latency_histogram"][float("inf")] == 1
+    assert len(events) == 3
+
+    df = metrics.to_dataframe()
+    assert df.loc[("result", "get"), "validation_time"] == 0.05
+
+    metrics.reset()
+    assert metrics.snapshot() == {}
+
+
+def test_client_request_compression():
+    import gzip
+    from concurrent.futures import ThreadPoolExecutor
+    from types import SimpleNamespace
+
+    client = th.offline_client(compression="gzip", compression_threshold=100)
+    client._set_encoding("json")
+    assert "gzip" in client._headers["Accept-Encoding"]
+
+    sent = []
+
+    def request(method, addr, data=None, headers=None, **kwargs):
+        sent.append((data, headers))
+        return SimpleNamespace(content=b"x" * 10, raw=None, status_code=200, reason="OK")
+
+    client._session.request = request
+
+    # JSON bodies are text and compressed once past the threshold
+    body = '{"data": "' + "a" * 1000 + '"}'
+    client._request("post", "molecule", data=body)
+    assert sent[-1][1]["Content-Encoding"] == "gzip"
+    assert gzip.decompress(sent[-1][0]) == body.encode()
+
+    client._request("post", "molecule", data='{"data": 1}')
+    assert "Content-Encoding" not in sent[-1][1]
+    assert sent[-1][0] == b'{"data": 1}'
+
+    stats = client.transfer_statistics()
+    assert stats["request_bytes"] == len(body) + 11
+    assert stats["request_bytes_sent"] == sum(len(x[0]) for x in sent)
+    assert stats["response_bytes"] == stats["response_bytes_received"] == 20
+    assert stats["compression_ratio"] > 1
+
+    # Counters stay exact with concurrent requests
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: client._request("post", "molecule", data=body), range(200)))
+    assert client.transfer_statistics()["request_bytes"] == 201 * len(body) + 11
+
+
+def _paging_client(total, gate=None):
+    client = th.offline_client(3)
+
+    calls = []
+
+    def query(limit, skip, **kwargs):
+        calls.append(skip)
+        if gate is not None and skip > 0:
+            gate.wait(5)
+        return list(range(total))[skip : skip + limit]
+
+    client.query_molecules = query
+    return client, calls
+
+
+@pytest.mark.parametrize("total, skips", [(7, [0, 3, 6]), (6, [0, 3, 6]), (0, [0])])
+def test_client_iter_pages(total, skips):
+    client, calls = _paging_client(total)
+
+    # Exact multiples of the page size end on an empty page, which is not yielded
+    assert list(client.iter_molecules()) == list(range(total))
+    assert calls == skips
+
+    client, calls = _paging_client(total)
+    pages = list(client.iter_molecules(batched=True, page_size=10))
+    assert all(len(page) == 3 for page in pages[:-1])
+    assert sum(pages, []) == list(range(total))
+
+    with pytest.raises(KeyError):
+        next(client.iter_molecules(limit=5))
+
+
+def test_client_iter_prefetch_and_close():
+    import threading
+    import time
+
+    gate = threading.Event()
+    client, calls = _paging_client(9, gate=gate)
+
+    # The next page is requested while the current one is consumed
+    it = client.iter_molecules()
+    assert next(it) == 0
+    deadline = time.time() + 5
+    while len(calls) < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls == [0, 3]
+
+    # Closing does not wait on the running prefetch and sends nothing further
+    start = time.time()
+    it.close()
+    assert time.time() - start < 1
+    gate.set()
+    time.sleep(0.1)
+    assert calls == [0, 3]
+
+
+def test_decode_json_response():
+    import json
+
+    from qcportal.client import _decode_response
+    from qcportal.models.rest_models import ProcedureGETResponse
+
+    meta = {"errors": [], "success": True, "error_description": False, "missing": [], "n_found": 1}
+    content = json.dumps({"meta": meta, "data": [{"id": "1"}]}).encode()
+
+    # Response bodies arrive as bytes for every encoding
+    response, _, _ = _decode_response(ProcedureGETResponse, content, "application/json")
+    assert response.data == [{"id": "1"}]
+
+
+def test_client_metrics_include_procedure_build(monkeypatch):
+    import json
+    import time
+    from types import SimpleNamespace
+
+    client = th.offline_client(10)
+    client._set_encoding("json")
+
+    meta = {"errors": [], "success": True, "error_description": False, "missing": [], "n_found": 2}
+    content = json.dumps({"meta": meta, "data": [{"id": "1"}, {"id": "2"}]}).encode()
+    client._request = lambda *args, **kwargs: SimpleNamespace(
+        content=content, headers={"Content-Type": "application/json"}
+    )
+
+    def build_procedure(data, client=None, validate=True):
+        time.sleep(0.05)
+        return data
+
+    monkeypatch.setattr(qcportal.client, "build_procedure", build_procedure)
+
+    # Building the records is part of the recorded validation time
+    assert len(client.query_procedures(id=["1", "2"])) == 2
+    assert client.metrics.snapshot()[("procedure", "get")]["validation_time"] >= 0.1
+
+    client.query_procedures(id=["1", "2"], include=["id"])
+    assert client.metrics.snapshot()[("procedure", "get")]["requests"] == 2
+
+
+def test_qcportal_import_time():
+    """Guards the cold import time by keeping heavy optional dependencies out of `import qcportal`"""
+    import json
+    import subprocess
+
+    code = (
+        "import json, sys, time; start = time.perf_counter(); import qcportal; "
+        "print(json.dumps([time.perf_counter() - start, sorted(sys.modules)]))"
+    )
+    import_time, modules = json.loads(subprocess.check_output([sys.executable, "-c", code]))
+
+    heavy = {"h5py", "pyarrow", "plotly", "tqdm", "pandas", "qcportal.collections"}
+    assert heavy.isdisjoint(modules)
+    assert import_time < 5.0
+
+
+def test_client_get_outputs():
+    client = th.offline_client(2)
+
+    kvstores = {
+        "1": qcportal.models.KVStore.compress("out 1", qcportal.models.CompressionEnum.lzma),
+        "2": qcportal.models.KVStore.compress("out 2", qcportal.models.CompressionEnum.gzip),
+        "3": qcportal.models.KVStore(data={"message": "failed"}),
+    }
+    calls = []
+
+    def query_kvstore(ids):
+        calls.append(ids)
+        return {x: kvstores[x] for x in ids}
+
+    client.query_kvstore = query_kvstore
+
+    records = [
+        qcportal.models.ResultRecord(
+            id=str(i), program="psi4", driver="energy", method="hf", basis="sto-3g", molecule="5", status="ERROR"
+        )
+        for i in range(3)
+    ]
+    for record, (stdout, error) in zip(records, [("1", "3"), ("2", None), ("1", "3")]):
+        record.__dict__.update(client=client, stdout=stdout, error=error)
+
+    ret = client.get_outputs(records, fields=["stdout", "error"], workers=2)
+
+    assert ret[0] == {"stdout": "out 1", "error": {"message": "failed"}}
+    assert ret[1] == {"stdout": "out 2", "error": None}
+    assert calls == [["1", "3"], ["2"]]
+
+    # Served from the record caches afterwards
+    assert records[2].get_stdout() == "out 1"
+    client.get_outputs(records, fields=["stdout"])
+    assert len(calls) == 2
+
+    with pytest.raises(KeyError):
+        client.get_outputs(records, fields=["stdin"])
+
+
+def test_client_get_wavefunctions(tmp_path):
+    import numpy as np
+
+    client = th.offline_client(100, max_workers=3)
+
+    calls = []
+
+    def custom_query(object_name, query_type, data, meta):
+        calls.append((data["id"], meta["include"]))
+        return {k: [[float(data["id"]), 0.0], [0.0, 1.0]] for k in meta["include"]}
+
+    client.custom_query = custom_query
+
+    wfn = {"return_map": {"orbitals_a": "scf_orbitals_a"}, "available": ["scf_orbitals_a", "scf_density_a"]}
+    records = []
+    for i in range(4):
+        record = qcportal.models.ResultRecord(
+            id=str(i), program="psi4", driver="energy", method="hf", basis="sto-3g", molecule="5", status="COMPLETE"
+        )
+        record.__dict__.update(client=client, wavefunction=wfn if i != 2 else None, wavefunction_data_id=str(10 + i))
+        records.append(record)
+
+    ret = client.get_wavefunctions(records, ["orbitals_a", "scf_density_a"])
+
+    assert ret[2] is None
+    assert isinstance(ret[3]["orbitals_a"], np.ndarray)
+    assert ret[3]["orbitals_a"][0, 0] == 13
+    assert sorted(calls) == [(str(10 + i), ["scf_density_a", "scf_orbitals_a"]) for i in (0, 1, 3)]
+
+    # Cached on the records, so the single record helper needs no further requests
+    assert records[1].get_wavefunction("orbitals_a")[0, 0] == 11
+    assert len(calls) == 3
+
+    with pytest.raises(KeyError):
+        client.get_wavefunctions(records, "hessian")
+
+    h5py = pytest.importorskip("h5py")
+    filename = str(tmp_path / "wfn.h5")
+    assert client.get_wavefunctions(records, "orbitals_a", filename=filename) is None
+    with h5py.File(filename, "r") as f:
+        assert sorted(f) == ["0", "1", "3"]
+        assert f["3/orbitals_a"][0, 0] == 13
@@ -43,6 +43,10 @@ setup(
         'nglview'
     ],
 
+    extras_require={
+        'async': ['httpx'],
+    },
+
     tests_require=[
         'pytest',
         'pytest-cov',